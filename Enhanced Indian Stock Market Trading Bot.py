@@ -13,13 +13,25 @@ import logging
 import time
 import asyncio
 import json
+import gzip
+import re
+import hashlib
 import random
+import bisect
+import threading
+import itertools
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta, time as dt_time
-import requests
+from urllib.parse import urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpx
 import pandas as pd
 import numpy as np
 from bs4 import BeautifulSoup
 from telegram import Update
+from telegram.error import RetryAfter
 from telegram.ext import Application, CommandHandler, MessageHandler, filters, ContextTypes
 from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
@@ -38,8 +50,92 @@ INDIAN_API_KEY = "sk-live-G5Wk78i1kbFjhTLQbeWSGTFUYuAu4wBeMfZzrW3m"  # Replace w
 # Initialize sentiment analyzer
 sentiment_analyzer = SentimentIntensityAnalyzer()
 
+# Batch sentiment configuration
+SENTIMENT_POOL_THRESHOLD = 100  # Unscored headlines in a batch before using the process pool
+SENTIMENT_POOL_CHUNK_SIZE = 50  # Headlines sent to a pool worker per task
+SENTIMENT_POOL_WORKERS = os.cpu_count() or 2
+
+# Process pool for large sentiment batches, created on first use
+_sentiment_pool = None
+
+# News dedupe configuration
+NEWS_DEDUPE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "processed_news.json")  # Snapshot of seen news between restarts
+NEWS_DEDUPE_WINDOW = 3 * 24 * 60 * 60  # Seconds a processed headline is remembered
+
+class NewsDedupeStore:
+    """Time-windowed set of processed news ids stored as compact hashes"""
+    
+    def __init__(self, path, window):
+        self.path = path
+        self.window = window
+        self._seen = {}  # Hashed news id -> first seen timestamp
+        self._dirty = False
+    
+    @staticmethod
+    def _key(news_id):
+        return hashlib.blake2b(news_id.encode('utf-8'), digest_size=8).hexdigest()
+    
+    def __contains__(self, news_id):
+        seen_at = self._seen.get(self._key(news_id))
+        return seen_at is not None and time.time() - seen_at <= self.window
+    
+    def __len__(self):
+        return len(self._seen)
+    
+    def add(self, news_id):
+        self._seen[self._key(news_id)] = time.time()
+        self._dirty = True
+    
+    def prune(self):
+        """Forget news ids older than the dedupe window"""
+        cutoff = time.time() - self.window
+        expired = [key for key, seen_at in self._seen.items() if seen_at < cutoff]
+        for key in expired:
+            del self._seen[key]
+        if expired:
+            self._dirty = True
+    
+    def load(self):
+        """Restore the snapshot written by a previous run"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._seen = {key: float(seen_at) for key, seen_at in json.load(f).items()}
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.error(f"Error loading processed news snapshot: {str(e)}")
+            return
+        
+        self.prune()
+        logger.info(f"Loaded {len(self._seen)} processed news ids")
+    
+    def save(self):
+        """Prune expired ids and snapshot the rest if anything changed"""
+        self.prune()
+        if not self._dirty:
+            return
+        
+        try:
+            # Write to a temporary file first so a crash never leaves a partial snapshot
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._seen, f, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except Exception as e:
+            logger.error(f"Error saving processed news snapshot: {str(e)}")
+
 # Store processed news to avoid duplicates
-processed_news = set()
+processed_news = NewsDedupeStore(NEWS_DEDUPE_FILE, NEWS_DEDUPE_WINDOW)
+
+# Telegram delivery configuration
+TELEGRAM_GLOBAL_RATE = 30  # Messages per second across all chats
+TELEGRAM_PER_CHAT_RATE = 1  # Sustained messages per second to one chat
+TELEGRAM_PER_CHAT_BURST = 3  # Messages one chat may receive back to back
+TELEGRAM_MAX_RETRIES = 3  # Retries after a 429 retry_after response
+DISPATCH_WORKERS = 3  # Concurrent alert senders
+IMPACT_PRIORITY = {"Low": 0, "Medium": 1, "High": 2}
+TELEGRAM_MESSAGE_LIMIT = 4000  # Characters per message, below Telegram's 4096 cap
 
 # Headers for web scraping
 headers = {
@@ -51,21 +147,489 @@ MARKET_OPEN_TIME = dt_time(9, 15)  # 9:15 AM
 MARKET_CLOSE_TIME = dt_time(15, 30)  # 3:30 PM
 MARKET_DAYS = [0, 1, 2, 3, 4]  # Monday to Friday (0-4)
 
+# Scheduling configuration
+OUTLOOK_TIME = dt_time(9, 0)  # Daily market outlook
+EOD_SUMMARY_TIME = dt_time(15, 45)  # End-of-day summary
+SCAN_INTERVAL_MIN = 60  # Tightest scan interval in seconds
+SCAN_INTERVAL_MAX = 900  # Loosest scan interval when the feed is quiet
+SCAN_BACKOFF_FACTOR = 1.5  # Interval growth per quiet cycle
+OPENING_RUSH_MINUTES = 30  # Minutes after the open polled at the tightest interval
+BUSY_FEED_HEADLINES = 10  # New headlines per cycle that count as a busy feed
+HIGH_VOLATILITY = 0.03  # Mean daily volatility that counts as a volatile session
+
+class MarketCalendar:
+    """Sorted exchange session table with O(log n) open and next-open lookups"""
+    
+    def __init__(self, sessions, holidays=None):
+        self.sessions = sorted(sessions)  # (open datetime, close datetime) pairs
+        self.holidays = holidays or {}  # ISO date -> holiday name
+        self._opens = [session_open for session_open, _ in self.sessions]
+        self._trading_days = {session_open.date() for session_open, _ in self.sessions}
+    
+    @classmethod
+    def from_file(cls, path):
+        """Build the session table from a calendar data file
+        
+        Regular sessions are generated for every trading weekday from the
+        first calendar year through the end of next year, minus holidays,
+        plus any special sessions such as Muhurat trading.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            logger.warning(f"Market calendar {path} not found; holidays will not be skipped")
+            data = {}
+        
+        regular = data.get('regular_session', {})
+        session_open = dt_time.fromisoformat(regular.get('open', MARKET_OPEN_TIME.isoformat()))
+        session_close = dt_time.fromisoformat(regular.get('close', MARKET_CLOSE_TIME.isoformat()))
+        trading_days = set(data.get('trading_days', MARKET_DAYS))
+        holidays = data.get('holidays', {})
+        special_sessions = data.get('special_sessions', [])
+        
+        years = [int(day[:4]) for day in holidays] + [int(s['date'][:4]) for s in special_sessions]
+        day = datetime(min(years + [datetime.now().year]), 1, 1).date()
+        last_day = datetime(max(years + [datetime.now().year]) + 1, 12, 31).date()
+        
+        sessions = []
+        while day <= last_day:
+            if day.weekday() in trading_days and day.isoformat() not in holidays:
+                sessions.append((datetime.combine(day, session_open), datetime.combine(day, session_close)))
+            day += timedelta(days=1)
+        
+        for special in special_sessions:
+            special_day = datetime.fromisoformat(special['date']).date()
+            sessions.append((
+                datetime.combine(special_day, dt_time.fromisoformat(special['open'])),
+                datetime.combine(special_day, dt_time.fromisoformat(special['close']))
+            ))
+        
+        return cls(sessions, holidays)
+    
+    def session_bounds(self, when):
+        """Return (open, close) of the session containing when, or None"""
+        i = bisect.bisect_right(self._opens, when) - 1
+        if i >= 0 and when <= self.sessions[i][1]:
+            return self.sessions[i]
+        return None
+    
+    def is_open(self, when):
+        return self.session_bounds(when) is not None
+    
+    def next_open(self, when):
+        """Return the first session open at or after when, or None past the table"""
+        i = bisect.bisect_left(self._opens, when)
+        return self._opens[i] if i < len(self._opens) else None
+    
+    def is_trading_day(self, day):
+        return day in self._trading_days
+
+# Exchange trading calendar shipped alongside this script
+MARKET_CALENDAR_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nse_calendar.json")
+market_calendar = MarketCalendar.from_file(MARKET_CALENDAR_FILE)
+
 def is_market_open():
     """Check if the market is currently open"""
-    now = datetime.now()
-    current_time = now.time()
-    current_day = now.weekday()
+    return market_calendar.is_open(datetime.now())
+
+def is_trading_day(day):
+    """Check if the exchange holds a session on the given date"""
+    return market_calendar.is_trading_day(day)
+
+def next_market_open(now):
+    """Return the datetime of the next market open at or after now"""
+    return market_calendar.next_open(now)
+
+# Metrics configuration
+METRICS_HOST = "127.0.0.1"  # Interface for the Prometheus-style endpoint
+METRICS_PORT = 9108  # Port for the Prometheus-style endpoint (0 disables it)
+ADMIN_CHAT_IDS = {TELEGRAM_CHAT_ID}  # Chats allowed to use admin commands such as /metrics
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+class MetricsRegistry:
+    """Thread-safe counters, gauges and histograms rendered in Prometheus text format"""
+    
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self._counters = defaultdict(float)
+        self._gauges = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
     
-    # Check if it's a weekday and within market hours
-    return (current_day in MARKET_DAYS and 
-            MARKET_OPEN_TIME <= current_time <= MARKET_CLOSE_TIME)
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted(labels.items()))
+    
+    def inc(self, name, amount=1, **labels):
+        with self._lock:
+            self._counters[self._key(name, labels)] += amount
+    
+    def set_gauge(self, name, value, **labels):
+        with self._lock:
+            self._gauges[self._key(name, labels)] = value
+    
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram['buckets'][i] += 1
+            histogram['sum'] += value
+            histogram['count'] += 1
+    
+    @contextmanager
+    def time(self, name, **labels):
+        """Observe the duration of a block in seconds"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+    
+    @staticmethod
+    def _format_labels(labels, extra=()):
+        pairs = list(labels) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{key}="{value}"' for key, value in pairs) + "}"
+    
+    def render(self):
+        """Render every metric in the Prometheus text exposition format"""
+        lines = []
+        
+        with self._lock:
+            typed = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} counter")
+                    typed.add(name)
+                lines.append(f"{name}{self._format_labels(labels)} {value}")
+            
+            for (name, labels), value in sorted(self._gauges.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} gauge")
+                    typed.add(name)
+                lines.append(f"{name}{self._format_labels(labels)} {value}")
+            
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                if name not in typed:
+                    lines.append(f"# TYPE {name} histogram")
+                    typed.add(name)
+                for bound, count in zip(self.buckets, histogram['buckets']):
+                    lines.append(f"{name}_bucket{self._format_labels(labels, [('le', bound)])} {count}")
+                lines.append(f"{name}_bucket{self._format_labels(labels, [('le', '+Inf')])} {histogram['count']}")
+                lines.append(f"{name}_sum{self._format_labels(labels)} {histogram['sum']}")
+                lines.append(f"{name}_count{self._format_labels(labels)} {histogram['count']}")
+        
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry(LATENCY_BUCKETS)
+
+async def timed_stage(stage, coroutine):
+    """Await a coroutine while recording its duration as a pipeline stage"""
+    with metrics.time("tradebot_stage_duration_seconds", stage=stage):
+        return await coroutine
+
+def endpoint_label(path):
+    """Collapse per-symbol API paths so metrics stay low-cardinality"""
+    return re.sub(r"^/stock/[^/]+", "/stock/{symbol}", path)
+
+def start_metrics_server(host=METRICS_HOST, port=METRICS_PORT):
+    """Serve the metrics registry over HTTP from a background thread"""
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.rstrip('/') not in ('', '/metrics'):
+                self.send_error(404)
+                return
+            
+            payload = metrics.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        
+        def log_message(self, format, *args):
+            pass
+    
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Metrics endpoint listening on http://{host}:{port}/metrics")
+    return server
+
+# IndianAPI.in client configuration
+INDIAN_API_BASE_URL = "https://indianapi.in/api/v1"
+HTTP_TIMEOUT = 10  # Seconds per request
+HTTP_MAX_CONNECTIONS = 20  # Total connections in the shared pool
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 10  # Idle connections kept open for reuse
+HTTP_PER_HOST_LIMIT = 5  # Maximum concurrent in-flight requests per host
+API_RECORD_FILE = os.environ.get("INDIAN_API_RECORD_FILE")  # Gzipped JSON lines log for replay_harness.py
+SCAN_MAX_WORKERS = 8  # Symbols fetched concurrently during a news scan
+SCAN_DEADLINE_FRACTION = 0.8  # Share of the scan interval a cycle may spend fetching market data
+SCAN_DEFERRED_LIMIT = 500  # Most news candidates carried over to the next cycle
+SIGNAL_COOLDOWN = 60 * 60  # Seconds before an unchanged institutional signal is alerted again
+SIGNAL_POSITION_CHANGE = 0.25  # Relative net position change that counts as a new signal
+SIGNAL_STATE_TTL = 24 * 60 * 60  # Seconds a symbol's last signal is remembered
+REPORT_SOURCE_TIMEOUT = 8  # Seconds each report data source may take
+NEWS_CURSOR_PARAM = None  # Query parameter for a published_at cursor, if IndianAPI supports one
+NEWS_FEED_SIZE = 500  # Latest headlines kept for command handlers
+SCAN_INTERVAL = 300  # Default seconds between scan cycles during market hours
+
+# Interval the scheduler chose for the current scan cycle
+current_scan_interval = SCAN_INTERVAL
+
+# Only one scan cycle may run at a time
+scan_lock = asyncio.Lock()
+deferred_candidates = []  # News candidates a cycle ran out of time to fetch data for
+
+# Shared async HTTP client, created lazily on the running event loop
+_http_client = None
+_http_client_loop = None
+_host_semaphores = {}
+
+def get_http_client():
+    """Return the shared keep-alive HTTP client for the running event loop"""
+    global _http_client, _http_client_loop
+    
+    loop = asyncio.get_running_loop()
+    if _http_client is None or _http_client_loop is not loop:
+        _http_client = httpx.AsyncClient(
+            headers={
+                'Authorization': f'Bearer {INDIAN_API_KEY}',
+                'Content-Type': 'application/json'
+            },
+            timeout=HTTP_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+            )
+        )
+        _http_client_loop = loop
+        _host_semaphores.clear()
+    
+    return _http_client
 
-def analyze_sentiment(text):
-    """Analyze the sentiment of news text using VADER"""
-    sentiment_dict = sentiment_analyzer.polarity_scores(text)
-    compound_score = sentiment_dict['compound']
+async def close_http_client(application=None):
+    """Close the shared HTTP client and release pooled connections"""
+    global _http_client, _http_client_loop
+    
+    if _http_client is not None:
+        await _http_client.aclose()
+    
+    _http_client = None
+    _http_client_loop = None
+    _host_semaphores.clear()
+
+async def indian_api_get(path, params=None, headers=None):
+    """Send a GET request to IndianAPI.in through the shared connection pool"""
+    url = f"{INDIAN_API_BASE_URL}{path}"
+    client = get_http_client()
+    
+    # Limit concurrent requests per host so a scan cannot flood the API
+    host = urlsplit(url).netloc
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = _host_semaphores[host] = asyncio.Semaphore(HTTP_PER_HOST_LIMIT)
+    
+    endpoint = endpoint_label(path)
+    metrics.inc("tradebot_upstream_requests_total", endpoint=endpoint)
+    
+    try:
+        async with semaphore:
+            with metrics.time("tradebot_upstream_request_duration_seconds", endpoint=endpoint):
+                response = await client.get(url, params=params, headers=headers)
+    except Exception:
+        metrics.inc("tradebot_upstream_errors_total", endpoint=endpoint)
+        raise
     
+    if response.status_code not in (200, 304):
+        metrics.inc("tradebot_upstream_errors_total", endpoint=endpoint)
+    
+    if API_RECORD_FILE:
+        record_api_response(path, params, response)
+    
+    return response
+
+def record_api_response(path, params, response):
+    """Append an IndianAPI response to the replay log"""
+    entry = {
+        'path': path,
+        'params': params,
+        'status': response.status_code,
+        'body': response.text
+    }
+    
+    try:
+        with gzip.open(API_RECORD_FILE, 'at', encoding='utf-8') as f:
+            f.write(json.dumps(entry, separators=(',', ':')) + "\n")
+    except Exception as e:
+        logger.error(f"Error recording API response: {str(e)}")
+
+# Cache configuration
+DEFAULT_VOLATILITY = 0.02  # 2% when historical data is unavailable
+STOP_LOSS_R = 1.0  # Stop-loss distance in volatilities; one R
+TARGET_R_MULTIPLES = [1.5, 2.5, 3.5]  # Targets T1-T3 as multiples of R
+# NSE tick size by price band as (upper price bound, tick in rupees)
+TICK_SIZE_BANDS = [
+    (250, 0.01),
+    (1000, 0.05),
+    (5000, 0.10),
+    (10000, 0.50),
+    (20000, 1.00),
+    (float('inf'), 5.00)
+]
+VOLATILITY_MODEL = "close_to_close"  # Price target volatility: "close_to_close", "ewma" or "atr"
+VOLATILITY_FLOOR = 0.015  # Minimum 1.5% volatility under every model
+VOLATILITY_LOOKBACK_DAYS = 20  # Daily closes used for close-to-close volatility
+EWMA_LOOKBACK_DAYS = 60  # Daily closes used for EWMA volatility
+EWMA_DECAY = 0.94  # RiskMetrics daily decay factor
+VOLATILITY_CACHE_TTL = 8 * 60 * 60  # Seconds; one trading session
+VOLATILITY_CACHE_SIZE = 1000  # Maximum symbols kept in the volatility cache
+VOLATILITY_WARM_LIMIT = 500  # Most symbols pre-computed by the daily warm-up
+QUOTE_FRESHNESS_SECONDS = 30  # How long a fetched quote is reused
+QUOTE_CACHE_SIZE = 1000  # Maximum symbols kept in the quote snapshot
+SENTIMENT_CACHE_SIZE = 5000  # Headlines whose VADER scores are memoized
+HISTORY_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "history")  # Per-symbol daily bar files
+HISTORY_BOOTSTRAP_PERIOD = '5y'  # Daily bars downloaded the first time a symbol is seen
+HISTORY_CACHE_SIZE = 1000  # Symbols whose daily history sync is remembered
+TICK_BUFFER_SIZE = 512  # Intraday quotes kept per symbol (a full session at one per minute)
+TICK_STORE_SYMBOLS = 1000  # Symbols with intraday quote history
+VOLUME_SPIKE_WINDOW = 30 * 60  # Seconds of recent volume compared with the session so far
+
+# Technical indicator configuration
+INDICATOR_MAX_SYMBOLS = 1000  # Symbols whose indicator state is kept in memory
+EMA_PERIODS = [12, 26, 50, 200]  # Exponential moving averages kept per symbol
+MACD_FAST = 12
+MACD_SLOW = 26
+MACD_SIGNAL = 9
+RSI_PERIOD = 14
+RSI_OVERBOUGHT = 70
+RSI_OVERSOLD = 30
+ATR_PERIOD = 14
+BOLLINGER_PERIOD = 20
+BOLLINGER_WIDTH = 2  # Band width in standard deviations
+
+# Market snapshot freshness as (fresh seconds, extra seconds served stale while refreshing)
+MARKET_SNAPSHOT_TTLS = {
+    'news': (60, 300),
+    'institutional': (120, 600),
+    'indices': (60, 300),
+    'most_active': (60, 300)
+}
+
+def cache_clock():
+    """Monotonic seconds that cache entries age by; patch this rather than time.monotonic"""
+    return time.monotonic()
+
+class TTLCache:
+    """Least-recently-used cache whose entries expire after a time-to-live"""
+    
+    def __init__(self, maxsize, ttl=None, name=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.name = name  # Label for hit/miss metrics; unnamed caches aren't counted
+        self._entries = OrderedDict()
+    
+    def _record(self, hit):
+        if self.name:
+            metrics.inc("tradebot_cache_hits_total" if hit else "tradebot_cache_misses_total", cache=self.name)
+    
+    def get(self, key, default=None):
+        """Return a live entry and mark it as recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._record(False)
+            return default
+        
+        stored_at, value = entry
+        if self.ttl is not None and cache_clock() - stored_at > self.ttl:
+            del self._entries[key]
+            self._record(False)
+            return default
+        
+        self._entries.move_to_end(key)
+        self._record(True)
+        return value
+    
+    def set(self, key, value):
+        """Store an entry, evicting the least recently used when full"""
+        self._entries[key] = (cache_clock(), value)
+        self._entries.move_to_end(key)
+        
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+    
+    def clear(self):
+        self._entries.clear()
+    
+    def __len__(self):
+        return len(self._entries)
+
+class SingleFlightCache:
+    """TTL cache where concurrent misses for the same key share one fetch
+    
+    With a stale_ttl, entries past their ttl are still served for up to
+    stale_ttl more seconds while a background fetch revalidates them.
+    """
+    
+    def __init__(self, maxsize, ttl, stale_ttl=0, name=None):
+        self.ttl = ttl
+        self._cache = TTLCache(maxsize, ttl=ttl + stale_ttl, name=name)
+        self._inflight = {}
+    
+    async def get(self, key, fetch, refresh=False):
+        """Return a cached value or join the in-flight fetch for it"""
+        entry = None if refresh else self._cache.get(key)
+        if entry is not None:
+            fetched_at, value = entry
+            if cache_clock() - fetched_at > self.ttl:
+                # Serve the stale value and revalidate it in the background
+                self._start_fetch(key, fetch)
+            return value
+        
+        # Shield the shared fetch so one cancelled caller doesn't cancel the rest
+        return await asyncio.shield(self._start_fetch(key, fetch))
+    
+    def _start_fetch(self, key, fetch):
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._load(key, fetch))
+            self._inflight[key] = task
+        return task
+    
+    async def _load(self, key, fetch):
+        try:
+            value = await fetch()
+            # Failed fetches return None and are not cached
+            if value is not None:
+                self._cache.set(key, (cache_clock(), value))
+            return value
+        except Exception as e:
+            logger.error(f"Error refreshing cached value for {key}: {str(e)}")
+            return None
+        finally:
+            self._inflight.pop(key, None)
+    
+    def clear(self):
+        self._cache.clear()
+
+# Historical volatility profiles ({model: volatility}) per (symbol, trading date)
+volatility_cache = TTLCache(VOLATILITY_CACHE_SIZE, ttl=VOLATILITY_CACHE_TTL, name="volatility")
+
+# Latest quote per symbol, shared by the scanner and command handlers
+quote_snapshot = SingleFlightCache(QUOTE_CACHE_SIZE, ttl=QUOTE_FRESHNESS_SECONDS, name="quote")
+
+# VADER scores per headline text (scores never change, so no TTL)
+sentiment_cache = TTLCache(SENTIMENT_CACHE_SIZE, name="sentiment")
+
+def classify_sentiment(compound_score):
+    """Map a VADER compound score to a sentiment label"""
     if compound_score >= 0.05:
         return "Positive"
     elif compound_score <= -0.05:
@@ -73,27 +637,149 @@ def analyze_sentiment(text):
     else:
         return "Neutral"
 
-def determine_news_impact(headline, sentiment, volume_change=None):
-    """Determine the impact level of news (Low/Medium/High)"""
-    # Keywords suggesting high impact news
-    high_impact_keywords = [
+def score_headline(text):
+    """Score text with VADER once, returning (compound score, sentiment label)"""
+    result = sentiment_cache.get(text)
+    if result is None:
+        compound_score = sentiment_analyzer.polarity_scores(text)['compound']
+        result = (compound_score, classify_sentiment(compound_score))
+        sentiment_cache.set(text, result)
+    
+    return result
+
+def analyze_sentiment(text):
+    """Analyze the sentiment of news text using VADER"""
+    return score_headline(text)[1]
+
+# News impact keyword configuration
+IMPACT_KEYWORDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "impact_keywords.json")  # Optional {"keyword": weight} lexicon
+DEFAULT_IMPACT_KEYWORD_WEIGHT = 2
+
+# Keywords suggesting high impact news, used when no lexicon file exists
+DEFAULT_IMPACT_KEYWORDS = {
+    keyword: DEFAULT_IMPACT_KEYWORD_WEIGHT for keyword in [
         "merger", "acquisition", "takeover", "buyout", "bankrupt", 
         "fraud", "scandal", "investigation", "lawsuit", "breakout", 
         "breakthrough", "fda approval", "patent granted", "major contract",
         "quarterly results", "profit warning", "guidance raised", "dividend",
         "stock split", "massive", "huge", "significant", "crisis"
     ]
+}
+
+def load_impact_keywords(path=IMPACT_KEYWORDS_FILE):
+    """Load the weighted impact keyword lexicon, falling back to the defaults"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            keywords = json.load(f)
+        return {str(keyword).lower(): float(weight) for keyword, weight in keywords.items()}
+    except FileNotFoundError:
+        return dict(DEFAULT_IMPACT_KEYWORDS)
+    except Exception as e:
+        logger.error(f"Error loading impact keywords from {path}: {str(e)}")
+        return dict(DEFAULT_IMPACT_KEYWORDS)
+
+def compile_keyword_matcher(keywords):
+    """Compile keywords into a single case-insensitive pattern matching at every position
     
-    # Calculate base impact score
-    impact_score = 0
+    The alternation sits in a lookahead, so matches may overlap; at each
+    position it captures the longest keyword starting there.
+    """
+    if not keywords:
+        return None
     
-    # Check for high impact keywords
-    for keyword in high_impact_keywords:
-        if keyword.lower() in headline.lower():
-            impact_score += 2
+    alternation = "|".join(re.escape(keyword) for keyword in sorted(keywords, key=len, reverse=True))
+    return re.compile(f"(?=({alternation}))", re.IGNORECASE)
+
+def nest_keywords(keywords):
+    """Map each keyword to itself and every other keyword it contains"""
+    return {keyword: {other for other in keywords if other in keyword} for keyword in keywords}
+
+# Built once at import so scoring cost doesn't grow with the lexicon size
+impact_keywords = load_impact_keywords()
+impact_keyword_matcher = compile_keyword_matcher(impact_keywords)
+impact_keyword_nesting = nest_keywords(impact_keywords)
+
+def score_impact_keywords(headline):
+    """Sum the weights of the distinct impact keywords found in a headline
+    
+    Like a substring test per keyword, a keyword nested inside a longer one
+    ("split" in "stock split") still adds its weight.
+    """
+    if impact_keyword_matcher is None:
+        return 0
+    
+    matched = set()
+    for match in impact_keyword_matcher.findall(headline):
+        matched |= impact_keyword_nesting[match.lower()]
+    return sum(impact_keywords[keyword] for keyword in matched)
+
+def _score_headlines_in_worker(headlines):
+    """Score a chunk of headlines inside a sentiment pool worker process"""
+    return [sentiment_analyzer.polarity_scores(headline)['compound'] for headline in headlines]
+
+def get_sentiment_pool():
+    """Return the shared process pool used for large sentiment batches"""
+    global _sentiment_pool
+    
+    if _sentiment_pool is None:
+        _sentiment_pool = ProcessPoolExecutor(max_workers=SENTIMENT_POOL_WORKERS)
+    
+    return _sentiment_pool
+
+def shutdown_sentiment_pool():
+    """Stop the sentiment pool workers"""
+    global _sentiment_pool
+    
+    if _sentiment_pool is not None:
+        _sentiment_pool.shutdown(wait=False, cancel_futures=True)
+        _sentiment_pool = None
+
+async def score_headlines_batch(headlines):
+    """Score a batch of headlines, returning {headline: (compound score, label)}"""
+    results = {}
+    pending = []
+    
+    for headline in dict.fromkeys(headlines):
+        cached = sentiment_cache.get(headline)
+        if cached is None:
+            pending.append(headline)
+        else:
+            results[headline] = cached
+    
+    # Large bursts are scored across cores so the event loop stays responsive
+    if len(pending) > SENTIMENT_POOL_THRESHOLD:
+        try:
+            loop = asyncio.get_running_loop()
+            pool = get_sentiment_pool()
+            chunks = [pending[i:i + SENTIMENT_POOL_CHUNK_SIZE]
+                      for i in range(0, len(pending), SENTIMENT_POOL_CHUNK_SIZE)]
+            chunk_scores = await asyncio.gather(
+                *(loop.run_in_executor(pool, _score_headlines_in_worker, chunk) for chunk in chunks)
+            )
+            
+            for chunk, scores in zip(chunks, chunk_scores):
+                for headline, compound_score in zip(chunk, scores):
+                    result = (compound_score, classify_sentiment(compound_score))
+                    sentiment_cache.set(headline, result)
+                    results[headline] = result
+            
+            return results
+        except Exception as e:
+            logger.error(f"Sentiment pool failed, scoring in process: {str(e)}")
+            shutdown_sentiment_pool()
+    
+    for headline in pending:
+        results[headline] = score_headline(headline)
+    
+    return results
+
+def determine_news_impact(headline, sentiment, volume_change=None):
+    """Determine the impact level of news (Low/Medium/High)"""
+    # Calculate base impact score from high impact keywords
+    impact_score = score_impact_keywords(headline)
     
     # Sentiment intensity affects impact
-    sentiment_magnitude = abs(sentiment_analyzer.polarity_scores(headline)['compound'])
+    sentiment_magnitude = abs(score_headline(headline)[0])
     impact_score += sentiment_magnitude * 3
     
     # Volume change affects impact (if provided)
@@ -113,43 +799,63 @@ def determine_news_impact(headline, sentiment, volume_change=None):
     else:
         return "Low"
 
-def determine_action(sentiment, volume_change=None, whale_activity=None):
-    """Determine trading action based on sentiment, volume and whale activity"""
+def describe_technical_confirmation(action, technicals):
+    """Reason suffix naming the technicals that agree with an action"""
+    if not technicals:
+        return ""
+    
+    confirmations = []
+    if 'macd' in technicals:
+        if action == "BUY" and technicals['macd'] > technicals['macd_signal']:
+            confirmations.append("bullish MACD")
+        elif action == "SELL" and technicals['macd'] < technicals['macd_signal']:
+            confirmations.append("bearish MACD")
+    
+    if 'ema_50' in technicals and 'ema_200' in technicals:
+        if action == "BUY" and technicals['ema_50'] > technicals['ema_200']:
+            confirmations.append("EMA-50 above EMA-200")
+        elif action == "SELL" and technicals['ema_50'] < technicals['ema_200']:
+            confirmations.append("EMA-50 below EMA-200")
+    
+    return f"; {', '.join(confirmations)}" if confirmations else ""
+
+def determine_action(sentiment, volume_change=None, whale_activity=None, technicals=None):
+    """Determine trading action based on sentiment, volume, whale activity and technicals"""
     # Strong whale activity is the most important signal
     if whale_activity:
         if whale_activity == "buying":
-            return "BUY", "Institutional buying detected"
+            return "BUY", "Institutional buying detected" + describe_technical_confirmation("BUY", technicals)
         elif whale_activity == "selling":
-            return "SELL", "Institutional selling detected"
+            return "SELL", "Institutional selling detected" + describe_technical_confirmation("SELL", technicals)
     
     # Significant volume change with matching sentiment
     if volume_change:
         if volume_change > 50 and sentiment == "Positive":
-            return "BUY", f"Unusual volume (+{volume_change}%) with positive sentiment"
+            return "BUY", f"Unusual volume (+{volume_change}%) with positive sentiment" + describe_technical_confirmation("BUY", technicals)
         elif volume_change > 50 and sentiment == "Negative":
-            return "SELL", f"Unusual volume (+{volume_change}%) with negative sentiment"
+            return "SELL", f"Unusual volume (+{volume_change}%) with negative sentiment" + describe_technical_confirmation("SELL", technicals)
+    
+    # Don't chase news into stretched RSI readings on sentiment alone
+    rsi = technicals.get('rsi') if technicals else None
+    if rsi is not None:
+        if sentiment == "Positive" and rsi >= RSI_OVERBOUGHT:
+            return "HOLD", f"Positive news but RSI {rsi:.0f} is overbought"
+        elif sentiment == "Negative" and rsi <= RSI_OVERSOLD:
+            return "HOLD", f"Negative news but RSI {rsi:.0f} is oversold"
     
     # Only use pure sentiment signals if they're strong
     if sentiment == "Positive":
-        return "BUY", "Strong positive sentiment in news"
+        return "BUY", "Strong positive sentiment in news" + describe_technical_confirmation("BUY", technicals)
     elif sentiment == "Negative":
-        return "SELL", "Strong negative sentiment in news"
+        return "SELL", "Strong negative sentiment in news" + describe_technical_confirmation("SELL", technicals)
     
     return "HOLD", "No clear signal"
 
-def fetch_stock_data_from_indian_api(symbol):
+async def fetch_stock_data_from_indian_api(symbol):
     """Fetch stock data from IndianAPI.in"""
     try:
         # Endpoint for stock quote
-        url = f"https://indianapi.in/api/v1/stock/{symbol}"
-        
-        # Add your API key to headers
-        api_headers = {
-            'Authorization': f'Bearer {INDIAN_API_KEY}',
-            'Content-Type': 'application/json'
-        }
-        
-        response = requests.get(url, headers=api_headers, timeout=10)
+        response = await indian_api_get(f"/stock/{symbol}")
         
         if response.status_code == 200:
             data = response.json()
@@ -162,127 +868,843 @@ def fetch_stock_data_from_indian_api(symbol):
         logger.error(f"Exception fetching data from IndianAPI: {str(e)}")
         return None
 
-def fetch_market_news_from_indian_api():
-    """Fetch latest market news from IndianAPI.in"""
-    try:
-        # Endpoint for market news
-        url = "https://indianapi.in/api/v1/news/market"
+class NewsPoller:
+    """Incremental poller for the market news feed
+    
+    Sends conditional request headers (and a published_at cursor when
+    NEWS_CURSOR_PARAM is set), and skips parsing when the payload is
+    unchanged. Headlines from each changed payload (only those since the
+    high-water mark in cursor mode) are queued until the scanner drains
+    them, whichever caller did the fetch.
+    """
+    
+    def __init__(self, feed_size):
+        self.feed_size = feed_size
+        self.items = []  # Latest full feed, newest first
+        self.high_water = None  # Newest published_at seen so far
+        self._etag = None
+        self._last_modified = None
+        self._payload_hash = None
+        self._pending = []
+    
+    def _remember_validators(self, response):
+        self._etag = response.headers.get('ETag', self._etag)
+        self._last_modified = response.headers.get('Last-Modified', self._last_modified)
+    
+    @staticmethod
+    def _news_id(news):
+        return f"{news.get('headline', '')}_{news.get('published_at', '')}"
+    
+    async def poll(self):
+        """Fetch the feed if it changed and return the full latest list"""
+        request_headers = {}
+        if self._etag:
+            request_headers['If-None-Match'] = self._etag
+        if self._last_modified:
+            request_headers['If-Modified-Since'] = self._last_modified
         
-        # Add your API key to headers
-        api_headers = {
-            'Authorization': f'Bearer {INDIAN_API_KEY}',
-            'Content-Type': 'application/json'
-        }
+        params = None
+        if NEWS_CURSOR_PARAM and self.high_water:
+            params = {NEWS_CURSOR_PARAM: self.high_water}
         
-        response = requests.get(url, headers=api_headers, timeout=10)
+        response = await indian_api_get("/news/market", params=params, headers=request_headers)
         
-        if response.status_code == 200:
-            news_items = response.json().get('data', [])
-            return news_items
-        else:
+        if response.status_code == 304:
+            metrics.inc("tradebot_news_polls_total", result="not_modified")
+            return self.items
+        
+        if response.status_code != 200:
             logger.error(f"Error fetching news from IndianAPI: {response.status_code}")
-            return []
+            return None
+        
+        # An identical payload needs no parsing at all
+        payload_hash = hashlib.blake2b(response.content, digest_size=16).digest()
+        if payload_hash == self._payload_hash:
+            self._remember_validators(response)
+            metrics.inc("tradebot_news_polls_total", result="unchanged")
+            return self.items
+        
+        fetched = response.json().get('data', [])
+        # Only remember the payload and its validators once it parsed, so a
+        # retry of it is neither skipped nor answered with a 304
+        self._payload_hash = payload_hash
+        self._remember_validators(response)
+        metrics.inc("tradebot_news_polls_total", result="changed")
+        
+        # With a cursor the response only holds new items, so merge it into the feed
+        if params:
+            fetched_ids = {self._news_id(news) for news in fetched}
+            self.items = (fetched + [news for news in self.items if self._news_id(news) not in fetched_ids])[:self.feed_size]
+        else:
+            self.items = fetched
+        
+        # With a cursor, drop anything older than the high-water mark. ISO 8601
+        # timestamps compare correctly as strings, and items at the mark itself
+        # are left to processed_news to dedupe. Without a cursor the full feed
+        # is queued, so items indexed late with an older timestamp still alert.
+        new_items = [
+            news for news in fetched
+            if not params or not news.get('published_at') or news['published_at'] >= self.high_water
+        ]
+        published = [news['published_at'] for news in fetched if news.get('published_at')]
+        if published:
+            self.high_water = max([self.high_water or ""] + published)
+        
+        self._pending.extend(new_items)
+        return self.items
+    
+    def drain(self):
+        """Return and clear the headlines queued since the last drain"""
+        pending, self._pending = self._pending, []
+        return pending
+
+news_poller = NewsPoller(NEWS_FEED_SIZE)
+
+async def fetch_market_news_from_indian_api():
+    """Fetch latest market news from IndianAPI.in, or None on failure"""
+    try:
+        # Endpoint for market news, polled incrementally
+        return await news_poller.poll()
     
     except Exception as e:
         logger.error(f"Exception fetching news from IndianAPI: {str(e)}")
-        return []
+        return None
 
-def fetch_institutional_activity():
-    """Fetch institutional/whale trading activity from IndianAPI.in"""
+async def fetch_institutional_activity():
+    """Fetch institutional/whale trading activity from IndianAPI.in, or None on failure"""
     try:
         # Endpoint for institutional activity
-        url = "https://indianapi.in/api/v1/institutions/activity"
-        
-        # Add your API key to headers
-        api_headers = {
-            'Authorization': f'Bearer {INDIAN_API_KEY}',
-            'Content-Type': 'application/json'
-        }
-        
-        response = requests.get(url, headers=api_headers, timeout=10)
+        response = await indian_api_get("/institutions/activity")
         
         if response.status_code == 200:
             activity_data = response.json().get('data', [])
             return activity_data
         else:
             logger.error(f"Error fetching institutional activity from IndianAPI: {response.status_code}")
-            return []
+            return None
     
     except Exception as e:
         logger.error(f"Exception fetching institutional activity from IndianAPI: {str(e)}")
-        return []
-
-def calculate_price_targets(current_price, action, volatility=None):
-    """Calculate precise entry, exit, target and stop-loss based on stock volatility"""
-    if not volatility:
-        # Default volatility if not provided
-        volatility = 0.02  # 2%
-    
-    if action == "BUY":
-        entry_price = current_price
-        stop_loss = round(current_price * (1 - volatility), 2)
-        target1 = round(current_price * (1 + volatility * 1.5), 2)
-        target2 = round(current_price * (1 + volatility * 2.5), 2)
-        target3 = round(current_price * (1 + volatility * 3.5), 2)
-    else:  # SELL
-        entry_price = current_price
-        stop_loss = round(current_price * (1 + volatility), 2)
-        target1 = round(current_price * (1 - volatility * 1.5), 2)
-        target2 = round(current_price * (1 - volatility * 2.5), 2)
-        target3 = round(current_price * (1 - volatility * 3.5), 2)
+        return None
+
+class PriceRingBuffer:
+    """Fixed-size circular arrays of (timestamp, price, cumulative volume) samples"""
     
-    return {
-        'entry_price': entry_price,
-        'stop_loss': stop_loss,
-        'target1': target1,
-        'target2': target2,
-        'target3': target3
-    }
+    def __init__(self, size):
+        self.size = size
+        self.timestamps = np.zeros(size)
+        self.prices = np.zeros(size)
+        self.volumes = np.zeros(size)
+        self.count = 0
+        self._next = 0
+    
+    def append(self, timestamp, price, volume):
+        self.timestamps[self._next] = timestamp
+        self.prices[self._next] = price
+        self.volumes[self._next] = volume
+        self._next = (self._next + 1) % self.size
+        self.count = min(self.count + 1, self.size)
+    
+    def last_timestamp(self):
+        return self.timestamps[self._next - 1] if self.count else None
+    
+    def window(self, seconds=None, now=None):
+        """Samples from the last seconds (all when None), oldest first"""
+        if self.count < self.size:
+            order = slice(0, self.count)
+            timestamps, prices, volumes = self.timestamps[order], self.prices[order], self.volumes[order]
+        else:
+            # Full buffer: the oldest sample sits at the write position
+            timestamps = np.concatenate((self.timestamps[self._next:], self.timestamps[:self._next]))
+            prices = np.concatenate((self.prices[self._next:], self.prices[:self._next]))
+            volumes = np.concatenate((self.volumes[self._next:], self.volumes[:self._next]))
+        
+        if seconds is not None:
+            now = time.time() if now is None else now
+            start = np.searchsorted(timestamps, now - seconds)
+            timestamps, prices, volumes = timestamps[start:], prices[start:], volumes[start:]
+        
+        return timestamps, prices, volumes
+    
+    def clear(self):
+        self.count = 0
+        self._next = 0
 
-def fetch_stock_volatility(symbol):
-    """Calculate stock volatility using IndianAPI.in historical data"""
-    try:
-        # Endpoint for historical data
-        url = f"https://indianapi.in/api/v1/stock/{symbol}/historical"
+class TickStore:
+    """Intraday quote history per symbol in bounded ring buffers
+    
+    Every fetched quote is appended, buffers reset at the first quote of a
+    new day, and the least recently updated symbols are evicted beyond
+    max_symbols. Quote volumes are cumulative for the day, so traded
+    volume between samples is their difference.
+    """
+    
+    def __init__(self, buffer_size, max_symbols):
+        self.buffer_size = buffer_size
+        self.max_symbols = max_symbols
+        self._buffers = OrderedDict()
+    
+    def record_quote(self, symbol, stock_data, timestamp=None):
+        """Append a quote's last price and cumulative volume"""
+        if not stock_data or stock_data.get('last_price') is None:
+            return
+        
+        timestamp = time.time() if timestamp is None else timestamp
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            buffer = PriceRingBuffer(self.buffer_size)
+            self._buffers[symbol] = buffer
+            while len(self._buffers) > self.max_symbols:
+                self._buffers.popitem(last=False)
+        else:
+            self._buffers.move_to_end(symbol)
+            last = buffer.last_timestamp()
+            if last is not None and datetime.fromtimestamp(last).date() != datetime.fromtimestamp(timestamp).date():
+                buffer.clear()
         
-        # Add your API key to headers
-        api_headers = {
-            'Authorization': f'Bearer {INDIAN_API_KEY}',
-            'Content-Type': 'application/json'
-        }
+        buffer.append(timestamp, float(stock_data['last_price']), float(stock_data.get('volume') or 0))
+    
+    def window(self, symbol, seconds=None, now=None):
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            return np.zeros(0), np.zeros(0), np.zeros(0)
+        return buffer.window(seconds, now)
+    
+    def intraday_return(self, symbol, seconds=None, now=None):
+        """Fractional price change over the window, or None with fewer than two samples"""
+        _, prices, _ = self.window(symbol, seconds, now)
+        if len(prices) < 2 or prices[0] <= 0:
+            return None
+        return prices[-1] / prices[0] - 1
+    
+    def vwap(self, symbol, seconds=None, now=None):
+        """Volume-weighted average price of the volume traded within the window"""
+        _, prices, volumes = self.window(symbol, seconds, now)
+        traded = np.clip(np.diff(volumes), 0, None)
+        if not traded.sum():
+            return None
+        return float(np.dot(prices[1:], traded) / traded.sum())
+    
+    def volume_spike(self, symbol, seconds=VOLUME_SPIKE_WINDOW, now=None):
+        """Percent change of the recent volume rate against the session's earlier rate
+        
+        Comparable to IndianAPI's volume_change_percent; None until the
+        buffer covers both the recent window and enough history before it.
+        """
+        now = time.time() if now is None else now
+        timestamps, _, volumes = self.window(symbol, now=now)
+        if len(timestamps) < 3:
+            return None
+        
+        split = np.searchsorted(timestamps, now - seconds)
+        if split < 2 or split >= len(timestamps):
+            return None
+        
+        # Volume rates per second before and within the recent window
+        baseline_rate = (volumes[split - 1] - volumes[0]) / max(timestamps[split - 1] - timestamps[0], 1)
+        recent_rate = (volumes[-1] - volumes[split - 1]) / max(timestamps[-1] - timestamps[split - 1], 1)
+        if baseline_rate <= 0:
+            return None
+        return round((recent_rate / baseline_rate - 1) * 100, 1)
+    
+    def clear(self):
+        self._buffers.clear()
+    
+    def __len__(self):
+        return len(self._buffers)
+
+# Intraday quote history shared by the scanner and command handlers
+tick_store = TickStore(TICK_BUFFER_SIZE, TICK_STORE_SYMBOLS)
+
+async def fetch_and_record_quote(symbol):
+    """Fetch a quote from IndianAPI.in and append it to the symbol's intraday history"""
+    stock_data = await fetch_stock_data_from_indian_api(symbol)
+    tick_store.record_quote(symbol, stock_data)
+    return stock_data
+
+async def get_stock_quote(symbol):
+    """Get a stock quote, reusing recent and in-flight fetches for the symbol"""
+    return await quote_snapshot.get(symbol, lambda: fetch_and_record_quote(symbol))
+
+def build_institutional_index(activity_data):
+    """Aggregate institutional activity rows into a table keyed by symbol"""
+    index = {}
+    
+    for activity in activity_data:
+        symbol = activity.get('symbol')
+        if not symbol:
+            continue
+        
+        entry = index.get(symbol)
+        if entry is None:
+            entry = index[symbol] = {
+                'symbol': symbol,
+                'net_position': 0,
+                'buy_quantity': 0,
+                'sell_quantity': 0
+            }
         
-        # Parameters for last 20 days
+        entry['net_position'] += activity.get('net_position', 0) or 0
+        entry['buy_quantity'] += activity.get('buy_quantity', 0) or 0
+        entry['sell_quantity'] += activity.get('sell_quantity', 0) or 0
+    
+    return index
+
+def count_institutional_positions(institutional_index):
+    """Count stocks with net institutional buying and net selling"""
+    net_buy = sum(1 for entry in institutional_index.values() if entry['net_position'] > 0)
+    net_sell = sum(1 for entry in institutional_index.values() if entry['net_position'] < 0)
+    return net_buy, net_sell
+
+def price_tick_sizes(prices):
+    """NSE tick size for each price from its price band"""
+    bounds = [upper for upper, _ in TICK_SIZE_BANDS]
+    ticks = np.array([tick for _, tick in TICK_SIZE_BANDS])
+    return ticks[np.minimum(np.searchsorted(bounds, prices, side='right'), len(ticks) - 1)]
+
+def round_to_tick(prices, ticks):
+    """Round prices to the nearest multiple of their tick size"""
+    return np.round(np.round(prices / ticks) * ticks, 2)
+
+def select_volatility(volatility, model=None):
+    """A volatility as a fraction of price, taking model (VOLATILITY_MODEL by
+    default) from a {model: volatility} profile; NaN when missing"""
+    if isinstance(volatility, dict):
+        volatility = volatility.get(model or VOLATILITY_MODEL)
+    return np.nan if volatility is None else volatility
+
+def calculate_price_targets_batch(prices, actions, volatilities=None, r_multiples=None, stop_r=STOP_LOSS_R, model=None):
+    """Entry, stop-loss and target levels with percent distances for many signals at once
+    
+    The stop sits stop_r volatilities from entry (1R) and target N at the
+    Nth R-multiple beyond it, every level rounded to its NSE tick. Each
+    volatility is a fraction of price or a {model: volatility} profile read
+    under model. Missing or zero volatilities use DEFAULT_VOLATILITY.
+    Returns {level: array}, including a signed '<level>_percent' distance
+    from entry for each.
+    """
+    prices = np.asarray(prices, dtype=float)
+    direction = np.where(np.asarray(actions) == "BUY", 1.0, -1.0)
+    r_multiples = TARGET_R_MULTIPLES if r_multiples is None else r_multiples
+    
+    if volatilities is None:
+        volatilities = np.full(len(prices), DEFAULT_VOLATILITY)
+    elif not isinstance(volatilities, np.ndarray):
+        volatilities = [select_volatility(volatility, model) for volatility in volatilities]
+    volatilities = np.asarray(volatilities, dtype=float)
+    volatilities = np.where(np.isnan(volatilities) | (volatilities <= 0), DEFAULT_VOLATILITY, volatilities)
+    
+    ticks = price_tick_sizes(prices)
+    risk = direction * prices * volatilities * stop_r
+    
+    levels = {
+        'entry_price': round_to_tick(prices, ticks),
+        'stop_loss': round_to_tick(prices - risk, ticks)
+    }
+    for number, multiple in enumerate(r_multiples, 1):
+        levels[f'target{number}'] = round_to_tick(prices + risk * multiple, ticks)
+    
+    entry = levels['entry_price']
+    for name in list(levels)[1:]:
+        levels[f'{name}_percent'] = np.round((levels[name] / entry - 1) * 100, 1)
+    
+    return levels
+
+def calculate_price_targets(current_price, action, volatility=None, model=None, r_multiples=None, stop_r=STOP_LOSS_R):
+    """Calculate precise entry, exit, target and stop-loss based on stock volatility
+    
+    volatility is a fraction of price, or a {model: volatility} profile
+    from which model (VOLATILITY_MODEL by default) is used. A one-signal
+    call into calculate_price_targets_batch, so both share one implementation;
+    the scan prices whole signal sets through the batch call directly.
+    """
+    levels = calculate_price_targets_batch([current_price], [action], [volatility], r_multiples, stop_r, model)
+    return {name: float(values[0]) for name, values in levels.items()}
+
+def attach_price_targets(pending, model=None):
+    """Compute price targets for (news item, price, volatility profile) entries in one batch"""
+    if not pending:
+        return
+    
+    items, prices, volatilities = zip(*pending)
+    levels = calculate_price_targets_batch(prices, [item['action'] for item in items], volatilities, model=model)
+    
+    for row, item in enumerate(items):
+        item['price_targets'] = {name: float(values[row]) for name, values in levels.items()}
+
+# Daily OHLCV bars on disk, one fixed-width record file per symbol
+HISTORY_DTYPE = np.dtype([
+    ('date', 'datetime64[D]'),
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'f8')
+])
+
+class HistoryStore:
+    """Append-only per-symbol OHLCV files read back as memory-mapped record arrays
+    
+    Records are fixed width and stored oldest first, so appending new days
+    is a plain binary append and reads map the file without copying. A
+    torn trailing record from an interrupted write is ignored on read.
+    """
+    
+    def __init__(self, directory):
+        self.directory = directory
+    
+    def path(self, symbol):
+        return os.path.join(self.directory, re.sub(r'[^A-Za-z0-9_.-]', '_', symbol) + ".ohlcv")
+    
+    def read(self, symbol):
+        """Map a symbol's full history read-only; fields such as ['close'] are views"""
+        path = self.path(symbol)
+        count = os.path.getsize(path) // HISTORY_DTYPE.itemsize if os.path.exists(path) else 0
+        if not count:
+            return np.zeros(0, dtype=HISTORY_DTYPE)
+        return np.memmap(path, dtype=HISTORY_DTYPE, mode='r', shape=(count,))
+    
+    def symbols(self, limit=None):
+        """Symbols with a stored history file, most recently updated first"""
+        if not os.path.isdir(self.directory):
+            return []
+        entries = [entry for entry in os.scandir(self.directory) if entry.name.endswith(".ohlcv")]
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        return [entry.name[:-len(".ohlcv")] for entry in entries[:limit]]
+    
+    def last_date(self, symbol):
+        history = self.read(symbol)
+        return history['date'][-1] if len(history) else None
+    
+    def append(self, symbol, records):
+        """Append records newer than the stored history, returning how many were written"""
+        last_date = self.last_date(symbol)
+        if last_date is not None:
+            records = records[records['date'] > last_date]
+        if not len(records):
+            return 0
+        
+        os.makedirs(self.directory, exist_ok=True)
+        path = self.path(symbol)
+        with open(path, 'ab') as f:
+            # Drop any torn record so appends stay aligned
+            f.truncate(os.path.getsize(path) // HISTORY_DTYPE.itemsize * HISTORY_DTYPE.itemsize)
+            f.write(records.astype(HISTORY_DTYPE).tobytes())
+        return len(records)
+
+history_store = HistoryStore(HISTORY_DIR)
+
+# Symbols whose stored history is current, keyed by (symbol, trading date)
+history_refreshes = SingleFlightCache(HISTORY_CACHE_SIZE, ttl=VOLATILITY_CACHE_TTL, name="history_refresh")
+
+async def fetch_price_history(symbol, period=HISTORY_BOOTSTRAP_PERIOD):
+    """Fetch daily OHLCV bars from IndianAPI.in as a record array, oldest first"""
+    try:
         params = {
             'interval': 'daily',
-            'period': '20d'
+            'period': period
         }
         
-        response = requests.get(url, headers=api_headers, params=params, timeout=10)
+        response = await indian_api_get(f"/stock/{symbol}/historical", params=params)
         
-        if response.status_code == 200:
-            data = response.json().get('data', [])
-            
-            if data:
-                # Extract closing prices
-                closes = [float(day['close']) for day in data]
-                
-                # Calculate daily returns
-                returns = [(closes[i] / closes[i-1]) - 1 for i in range(1, len(closes))]
-                
-                # Calculate volatility as standard deviation of returns
-                volatility = np.std(returns)
-                
-                # Add a minimum volatility floor
-                return max(volatility, 0.015)  # Minimum 1.5% volatility
-            else:
-                return 0.02  # Default 2% if no data
-        else:
+        if response.status_code != 200:
             logger.error(f"Error fetching historical data from IndianAPI: {response.status_code}")
-            return 0.02  # Default 2% if API error
+            return None
+        
+        data = response.json().get('data', [])
+        if not data:
+            return None
+        
+        records = np.array([
+            (
+                np.datetime64(str(day['date'])[:10], 'D'),
+                float(day.get('open') or day['close']),
+                float(day.get('high') or day['close']),
+                float(day.get('low') or day['close']),
+                float(day['close']),
+                float(day.get('volume') or 0)
+            )
+            for day in data
+        ], dtype=HISTORY_DTYPE)
+        
+        # Sort by date and keep one bar per day, whatever order the API used
+        _, first = np.unique(records['date'], return_index=True)
+        return records[first]
+    
+    except Exception as e:
+        logger.error(f"Exception fetching price history: {str(e)}")
+        return None
+
+def last_completed_session(today):
+    """The most recent trading day before today, whose daily bar is final"""
+    day = today - timedelta(days=1)
+    for _ in range(30):
+        if is_trading_day(day):
+            return day
+        day -= timedelta(days=1)
+    return day
+
+async def sync_price_history(symbol):
+    """Download only the days missing from the stored history and append them"""
+    today = datetime.now().date()
+    last_date = history_store.last_date(symbol)
+    
+    if last_date is not None:
+        last_day = last_date.astype(object)
+        if last_day >= last_completed_session(today):
+            return True
+        # Ask for the gap plus a margin, since the period may count calendar or trading days
+        period = f"{(today - last_day).days + 5}d"
+    else:
+        period = HISTORY_BOOTSTRAP_PERIOD
+    
+    records = await fetch_price_history(symbol, period)
+    if records is None:
+        return None
+    
+    # Today's bar is still forming, so it's never stored
+    records = records[records['date'] < np.datetime64(today, 'D')]
+    appended = history_store.append(symbol, records)
+    metrics.inc("tradebot_history_bars_appended_total", appended)
+    return True
+
+async def load_price_history(symbol):
+    """Stored daily history for a symbol, synced with IndianAPI at most once per trading day
+    
+    When the sync fails, whatever is already on disk is still returned.
+    """
+    await history_refreshes.get((symbol, datetime.now().date()), lambda: sync_price_history(symbol))
+    return history_store.read(symbol)
+
+# Volatility models, vectorized across symbols
+VOLATILITY_HISTORY_BARS = max(VOLATILITY_LOOKBACK_DAYS, EWMA_LOOKBACK_DAYS, ATR_PERIOD + 1)  # Bars any model reads
+
+def stack_history(histories, field, lookback):
+    """Right-align the last lookback values of a field per history into a NaN-padded 2-D array"""
+    matrix = np.full((len(histories), lookback), np.nan)
+    for row, history in enumerate(histories):
+        values = history[field][-lookback:]
+        if len(values):
+            matrix[row, lookback - len(values):] = values
+    return matrix
+
+def close_to_close_volatility(closes):
+    """Standard deviation of daily returns for each row of a 2-D close array"""
+    returns = closes[:, 1:] / closes[:, :-1] - 1
+    valid = ~np.isnan(returns)
+    count = valid.sum(axis=1)
+    mean = np.where(valid, returns, 0).sum(axis=1) / count
+    deviations = np.where(valid, returns - mean[:, None], 0)
+    return np.sqrt((deviations ** 2).sum(axis=1) / count)
+
+def ewma_volatility(closes, decay=EWMA_DECAY):
+    """RiskMetrics-style exponentially weighted volatility for each row, newest returns weighted most"""
+    returns = closes[:, 1:] / closes[:, :-1] - 1
+    valid = ~np.isnan(returns)
+    weights = np.where(valid, decay ** np.arange(returns.shape[1] - 1, -1, -1), 0)
+    return np.sqrt((weights * np.where(valid, returns, 0) ** 2).sum(axis=1) / weights.sum(axis=1))
+
+def atr_volatility(highs, lows, closes, period=ATR_PERIOD):
+    """Average true range over the last period days as a fraction of the previous close"""
+    previous = closes[:, :-1]
+    true_range = np.fmax(highs[:, 1:] - lows[:, 1:], np.fmax(
+        np.abs(highs[:, 1:] - previous), np.abs(lows[:, 1:] - previous)
+    ))
+    ratio = (true_range / previous)[:, -period:]
+    valid = ~np.isnan(ratio)
+    return np.where(valid, ratio, 0).sum(axis=1) / valid.sum(axis=1)
+
+def compute_volatility_profiles(histories):
+    """Volatility under every model for many symbols in one pass
+    
+    Returns {model: 1-D array aligned with histories}, floored at
+    VOLATILITY_FLOOR, with NaN where a history is too short.
+    """
+    lookback = VOLATILITY_HISTORY_BARS
+    closes = stack_history(histories, 'close', lookback)
+    highs = stack_history(histories, 'high', lookback)
+    lows = stack_history(histories, 'low', lookback)
+    
+    # Short histories divide by zero valid samples; those rows come out NaN
+    with np.errstate(invalid='ignore', divide='ignore'):
+        profiles = {
+            'close_to_close': close_to_close_volatility(closes[:, -VOLATILITY_LOOKBACK_DAYS:]),
+            'ewma': ewma_volatility(closes[:, -EWMA_LOOKBACK_DAYS:]),
+            'atr': atr_volatility(highs, lows, closes)
+        }
+    
+    return {model: np.maximum(values, VOLATILITY_FLOOR) for model, values in profiles.items()}
+
+async def refresh_volatility_profiles(symbols):
+    """Compute and cache every volatility model for many symbols at once
+    
+    Histories come from the local store (synced at most once per day), so
+    after the first refresh of the day this touches no network at all.
+    """
+    symbols = [symbol for symbol in dict.fromkeys(symbols) if symbol]
+    if not symbols:
+        return {}
+    
+    semaphore = asyncio.Semaphore(SCAN_MAX_WORKERS)
+    
+    async def load_symbol(symbol):
+        async with semaphore:
+            # Copy only the bars the models read, so each memmap and its file
+            # descriptor is released at once rather than held for the whole batch
+            return np.array((await load_price_history(symbol))[-VOLATILITY_HISTORY_BARS:])
+    
+    histories = await asyncio.gather(*(load_symbol(symbol) for symbol in symbols))
+    with metrics.time("tradebot_stage_duration_seconds", stage="volatility_models"):
+        profiles = compute_volatility_profiles(histories)
+    
+    today = datetime.now().date()
+    results = {}
+    for row, symbol in enumerate(symbols):
+        profile = {model: float(values[row]) for model, values in profiles.items() if not np.isnan(values[row])}
+        if profile:
+            volatility_cache.set((symbol, today), profile)
+            results[symbol] = profile
+    
+    return results
+
+async def fetch_volatility_profile(symbol):
+    """Get a symbol's {model: volatility} profile, computed at most once per trading day, or None"""
+    # Daily closes do not change during the session, so key by trading date
+    cache_key = (symbol, datetime.now().date())
+    profile = volatility_cache.get(cache_key)
+    if profile is None:
+        # Failures aren't cached, so the next signal retries
+        profile = (await refresh_volatility_profiles([symbol])).get(symbol)
+    return profile
+
+async def fetch_stock_volatility(symbol, model=None):
+    """Get stock volatility under a model, computing profiles at most once per trading day"""
+    profile = await fetch_volatility_profile(symbol)
+    if not profile:
+        return DEFAULT_VOLATILITY
+    return profile.get(model or VOLATILITY_MODEL, DEFAULT_VOLATILITY)
+
+async def warm_volatility_cache(symbols):
+    """Pre-compute volatility for symbols expected to trade this session
+    
+    The given symbols come first, then the most recently updated stored
+    histories, up to VOLATILITY_WARM_LIMIT in all.
+    """
+    symbols = list(dict.fromkeys(list(symbols) + history_store.symbols(VOLATILITY_WARM_LIMIT)))[:VOLATILITY_WARM_LIMIT]
+    profiles = await refresh_volatility_profiles(symbols)
+    logger.info(f"Volatility cache warmed for {len(profiles)} of {len(symbols)} symbols")
+
+# Technical indicators computed locally from daily bars
+def ema_series(values, alpha):
+    """Exponential moving average of a 1-D array, seeded with its first value
+    
+    Vectorized with cumulative sums in chunks short enough that the decay
+    powers stay well within float64 precision.
+    """
+    if not 0 < alpha <= 1:
+        raise ValueError(f"EMA alpha must be in (0, 1], got {alpha}")
+    
+    values = np.asarray(values, dtype=float)
+    result = np.empty_like(values)
+    if not len(values):
+        return result
+    
+    # An alpha of 1 (a period of 1) keeps no memory, and its decay powers would divide by zero
+    if alpha == 1:
+        result[:] = values
+        return result
+    
+    decay = 1.0 - alpha
+    chunk = max(1, int(np.log(1e6) / -np.log(decay)))
+    previous = values[0]
+    
+    for start in range(0, len(values), chunk):
+        window = values[start:start + chunk]
+        steps = np.arange(1, len(window) + 1)
+        result[start:start + len(window)] = decay ** steps * (previous + alpha * np.cumsum(window * decay ** -steps))
+        previous = result[start + len(window) - 1]
+    
+    return result
+
+def wilder_average(values, period):
+    """Wilder's smoothed average: the simple mean of the first period values,
+    then an EMA with alpha 1/period over the rest"""
+    values = np.asarray(values, dtype=float)
+    if len(values) <= period:
+        return float(values.mean()) if len(values) else 0.0
+    seeded = np.concatenate(([values[:period].mean()], values[period:]))
+    return float(ema_series(seeded, 1.0 / period)[-1])
+
+class IndicatorEngine:
+    """Per-symbol RSI, MACD, EMAs, ATR and Bollinger bands over daily bars
+    
+    seed() computes the recursive indicator state from a full history with
+    NumPy, update() folds in one completed bar in O(1), and peek() returns
+    the indicators as if the live intraday bar were complete, without
+    committing it. Beyond max_symbols the least recently used symbol is
+    evicted and re-seeded from stored history when next needed.
+    """
+    
+    def __init__(self, max_symbols):
+        self.max_symbols = max_symbols
+        self._states = OrderedDict()
+    
+    def _store(self, symbol, state):
+        self._states[symbol] = state
+        self._states.move_to_end(symbol)
+        while len(self._states) > self.max_symbols:
+            self._states.popitem(last=False)
+    
+    def seed(self, symbol, history):
+        """Compute indicator state from OHLCV arrays, oldest bar first"""
+        closes = np.asarray(history['close'], dtype=float)
+        if len(closes) < 2:
+            return
+        highs = np.asarray(history['high'], dtype=float)
+        lows = np.asarray(history['low'], dtype=float)
+        
+        emas = {period: ema_series(closes, 2.0 / (period + 1)) for period in EMA_PERIODS}
+        macd = emas[MACD_FAST] - emas[MACD_SLOW]
+        
+        # RSI and ATR use Wilder's smoothing, seeded with a simple average
+        changes = np.diff(closes)
+        avg_gain = wilder_average(np.maximum(changes, 0), RSI_PERIOD)
+        avg_loss = wilder_average(np.maximum(-changes, 0), RSI_PERIOD)
+        
+        true_range = np.maximum(highs[1:] - lows[1:], np.maximum(
+            np.abs(highs[1:] - closes[:-1]), np.abs(lows[1:] - closes[:-1])
+        ))
+        
+        self._store(symbol, {
+            'date': history['date'][-1],
+            'bars': len(closes),
+            'close': float(closes[-1]),
+            'emas': {period: float(ema[-1]) for period, ema in emas.items()},
+            'macd_signal': float(ema_series(macd, 2.0 / (MACD_SIGNAL + 1))[-1]),
+            'avg_gain': float(avg_gain),
+            'avg_loss': float(avg_loss),
+            'atr': wilder_average(true_range, ATR_PERIOD),
+            'window': [float(close) for close in closes[-BOLLINGER_PERIOD:]]
+        })
+    
+    @staticmethod
+    def _advance(state, high, low, close, date=None):
+        """Return the state after one more bar, leaving the input untouched"""
+        previous_close = state['close']
+        change = close - previous_close
+        rsi_alpha = 1.0 / RSI_PERIOD
+        atr_alpha = 1.0 / ATR_PERIOD
+        true_range = max(high - low, abs(high - previous_close), abs(low - previous_close))
+        
+        emas = {
+            period: ema + 2.0 / (period + 1) * (close - ema)
+            for period, ema in state['emas'].items()
+        }
+        macd = emas[MACD_FAST] - emas[MACD_SLOW]
+        
+        return {
+            'date': state['date'] if date is None else date,
+            'bars': state['bars'] + 1,
+            'close': close,
+            'emas': emas,
+            'macd_signal': state['macd_signal'] + 2.0 / (MACD_SIGNAL + 1) * (macd - state['macd_signal']),
+            'avg_gain': state['avg_gain'] + rsi_alpha * (max(change, 0) - state['avg_gain']),
+            'avg_loss': state['avg_loss'] + rsi_alpha * (max(-change, 0) - state['avg_loss']),
+            'atr': state['atr'] + atr_alpha * (true_range - state['atr']),
+            'window': (state['window'] + [close])[-BOLLINGER_PERIOD:]
+        }
+    
+    def update(self, symbol, high, low, close, date):
+        """Fold one completed daily bar into a seeded symbol"""
+        state = self._states.get(symbol)
+        if state is not None:
+            self._store(symbol, self._advance(state, float(high), float(low), float(close), date))
+    
+    def peek(self, symbol, high=None, low=None, close=None):
+        """Indicators for a symbol, including an uncommitted live bar when close is given"""
+        state = self._states.get(symbol)
+        if state is None:
+            return None
+        self._states.move_to_end(symbol)
+        
+        if close is not None:
+            close = float(close)
+            high = float(high) if high is not None else close
+            low = float(low) if low is not None else close
+            state = self._advance(state, high, low, close)
+        
+        return self._snapshot(state)
+    
+    def peek_quote(self, symbol, stock_data):
+        """Indicators with a live quote from IndianAPI folded in"""
+        if not stock_data or stock_data.get('last_price') is None:
+            return self.peek(symbol)
+        return self.peek(symbol, stock_data.get('high'), stock_data.get('low'), stock_data['last_price'])
+    
+    @staticmethod
+    def _snapshot(state):
+        """Indicator values, leaving out those still inside their warm-up period"""
+        bars = state['bars']
+        emas = state['emas']
+        macd = emas[MACD_FAST] - emas[MACD_SLOW]
+        window = state['window']
+        
+        if state['avg_loss'] > 0:
+            rsi = 100 - 100 / (1 + state['avg_gain'] / state['avg_loss'])
+        else:
+            rsi = 100.0 if state['avg_gain'] > 0 else 50.0
+        
+        technicals = {'close': state['close'], 'bars': bars}
+        for period, ema in emas.items():
+            if bars >= period:
+                technicals[f'ema_{period}'] = ema
+        if bars > RSI_PERIOD:
+            technicals['rsi'] = rsi
+        if bars >= MACD_SLOW + MACD_SIGNAL:
+            technicals['macd'] = macd
+            technicals['macd_signal'] = state['macd_signal']
+            technicals['macd_histogram'] = macd - state['macd_signal']
+        if bars > ATR_PERIOD:
+            technicals['atr'] = state['atr']
+        if len(window) >= BOLLINGER_PERIOD:
+            middle = sum(window) / len(window)
+            deviation = (sum((close - middle) ** 2 for close in window) / len(window)) ** 0.5
+            technicals['bollinger_middle'] = middle
+            technicals['bollinger_upper'] = middle + BOLLINGER_WIDTH * deviation
+            technicals['bollinger_lower'] = middle - BOLLINGER_WIDTH * deviation
+        
+        return technicals
     
-    except Exception as e:
-        logger.error(f"Exception calculating volatility: {str(e)}")
-        return 0.02  # Default 2% if exception
+    def last_bar_date(self, symbol):
+        state = self._states.get(symbol)
+        return state['date'] if state else None
+    
+    def clear(self):
+        self._states.clear()
+    
+    def __len__(self):
+        return len(self._states)
+
+indicator_engine = IndicatorEngine(INDICATOR_MAX_SYMBOLS)
+
+async def ensure_indicator_history(symbol):
+    """Bring a symbol's indicators up to the last completed daily bar
+    
+    The first call seeds the engine from the stored history; later calls
+    only fold in the bars appended since the last one seen.
+    """
+    history = await load_price_history(symbol)
+    if not len(history):
+        return False
+    
+    last_date = indicator_engine.last_bar_date(symbol)
+    if last_date is None:
+        indicator_engine.seed(symbol, history)
+    else:
+        for i in range(np.searchsorted(history['date'], last_date, side='right'), len(history)):
+            indicator_engine.update(symbol, history['high'][i], history['low'][i], history['close'][i], history['date'][i])
+    
+    return True
 
 def format_alert(news_item):
     """Format alert message for Telegram with enhanced emojis"""
@@ -317,22 +1739,19 @@ def format_alert(news_item):
     if 'price_targets' in news_item:
         targets = news_item['price_targets']
         
-        if news_item['action'] == "BUY":
-            price_section = f"""
-💰 *Entry:* ₹{targets['entry_price']}
-🎯 *Targets:*
-  T1: ₹{targets['target1']} (+{round((targets['target1']/targets['entry_price']-1)*100, 1)}%)
-  T2: ₹{targets['target2']} (+{round((targets['target2']/targets['entry_price']-1)*100, 1)}%)
-  T3: ₹{targets['target3']} (+{round((targets['target3']/targets['entry_price']-1)*100, 1)}%)
-🛑 *Stop Loss:* ₹{targets['stop_loss']} (-{round((1-targets['stop_loss']/targets['entry_price'])*100, 1)}%)"""
-        else:  # SELL
-            price_section = f"""
-💰 *Entry:* ₹{targets['entry_price']}
-🎯 *Targets:*
-  T1: ₹{targets['target1']} (-{round((1-targets['target1']/targets['entry_price'])*100, 1)}%)
-  T2: ₹{targets['target2']} (-{round((1-targets['target2']/targets['entry_price'])*100, 1)}%)
-  T3: ₹{targets['target3']} (-{round((1-targets['target3']/targets['entry_price'])*100, 1)}%)
-🛑 *Stop Loss:* ₹{targets['stop_loss']} (+{round((targets['stop_loss']/targets['entry_price']-1)*100, 1)}%)"""
+        # Percent distances are precomputed with the levels, signed from entry
+        target_numbers = sorted(
+            int(name[len('target'):]) for name in targets
+            if name.startswith('target') and name[len('target'):].isdigit()
+        )
+        target_lines = "".join(
+            f"\n  T{number}: ₹{targets[f'target{number}']:.2f} ({targets[f'target{number}_percent']:+.1f}%)"
+            for number in target_numbers
+        )
+        price_section = f"""
+💰 *Entry:* ₹{targets['entry_price']:.2f}
+🎯 *Targets:*{target_lines}
+🛑 *Stop Loss:* ₹{targets['stop_loss']:.2f} ({targets['stop_loss_percent']:+.1f}%)"""
     else:
         price_section = ""
         
@@ -356,20 +1775,379 @@ def format_alert(news_item):
 """
     return message
 
-async def send_telegram_alert(bot, message):
+async def fetch_symbols_market_data(symbols, deadline=None):
+    """Fetch quotes and volatility profiles for many symbols with bounded concurrency
+    
+    Returns {symbol: (quote, {model: volatility} profile or None)}, so the
+    volatility model is picked when the signals are priced. Symbols start
+    in the given order. Once the monotonic deadline passes no
+    new fetches start, and the symbols not yet started are left out of the
+    result so the caller can defer them.
+    """
+    # Compute every uncached volatility profile in one vectorized pass, so the
+    # per-symbol fetches below hit the cache; symbols it misses refresh individually
+    today = datetime.now().date()
+    uncached = [symbol for symbol in symbols if volatility_cache.get((symbol, today)) is None]
+    if uncached:
+        timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+        try:
+            await asyncio.wait_for(timed_stage("volatility_batch", refresh_volatility_profiles(uncached)), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Volatility refresh for {len(uncached)} symbols ran past the scan deadline")
+    
+    semaphore = asyncio.Semaphore(SCAN_MAX_WORKERS)
+    
+    async def fetch_symbol(symbol):
+        async with semaphore:
+            if deadline is not None and time.monotonic() >= deadline:
+                return symbol, None
+            
+            # Quote, volatility and indicator history are independent, so request them together
+            stock_data, volatility, _ = await asyncio.gather(
+                timed_stage("quote", get_stock_quote(symbol)),
+                timed_stage("volatility", fetch_volatility_profile(symbol)),
+                timed_stage("indicator_history", ensure_indicator_history(symbol))
+            )
+        return symbol, (stock_data, volatility)
+    
+    results = await asyncio.gather(*(fetch_symbol(symbol) for symbol in symbols))
+    return {symbol: data for symbol, data in results if data is not None}
+
+class TokenBucket:
+    """Rate limiter that allows bursts up to capacity and refills at a fixed rate"""
+    
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+    
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+# Telegram send limits shared by every outgoing message
+telegram_global_bucket = TokenBucket(TELEGRAM_GLOBAL_RATE, TELEGRAM_GLOBAL_RATE)
+telegram_chat_buckets = {}
+
+async def send_telegram_alert(bot, message, chat_id=TELEGRAM_CHAT_ID):
     """Send alert message to Telegram"""
-    try:
-        await bot.send_message(
-            chat_id=TELEGRAM_CHAT_ID,
-            text=message,
-            parse_mode='Markdown',
-            disable_web_page_preview=True
-        )
-        logger.info("Alert sent successfully")
-        return True
-    except Exception as e:
-        logger.error(f"Error sending Telegram message: {str(e)}")
-        return False
+    chat_bucket = telegram_chat_buckets.get(chat_id)
+    if chat_bucket is None:
+        chat_bucket = telegram_chat_buckets[chat_id] = TokenBucket(TELEGRAM_PER_CHAT_RATE, TELEGRAM_PER_CHAT_BURST)
+    
+    for attempt in range(TELEGRAM_MAX_RETRIES + 1):
+        try:
+            await chat_bucket.acquire()
+            await telegram_global_bucket.acquire()
+            with metrics.time("tradebot_stage_duration_seconds", stage="send"):
+                await bot.send_message(
+                    chat_id=chat_id,
+                    text=message,
+                    parse_mode='Markdown',
+                    disable_web_page_preview=True
+                )
+            metrics.inc("tradebot_telegram_messages_total", status="sent")
+            logger.info("Alert sent successfully")
+            return True
+        except RetryAfter as e:
+            metrics.inc("tradebot_telegram_messages_total", status="rate_limited")
+            # Telegram asked us to back off; honour the delay and retry
+            retry_after = e.retry_after
+            if isinstance(retry_after, timedelta):
+                retry_after = retry_after.total_seconds()
+            logger.warning(f"Telegram rate limit hit, retrying in {retry_after}s")
+            await asyncio.sleep(retry_after)
+        except Exception as e:
+            metrics.inc("tradebot_telegram_messages_total", status="failed")
+            logger.error(f"Error sending Telegram message: {str(e)}")
+            return False
+    
+    metrics.inc("tradebot_telegram_messages_total", status="failed")
+    logger.error("Giving up on Telegram message after repeated rate limiting")
+    return False
+
+class AlertDispatcher:
+    """Background sender that delivers queued alerts highest priority first"""
+    
+    def __init__(self, workers):
+        self.workers = workers
+        self._queue = None
+        self._tasks = []
+        self._loop = None
+        self._sequence = itertools.count()
+    
+    def _ensure_started(self):
+        loop = asyncio.get_running_loop()
+        if self._queue is not None and self._loop is loop:
+            return
+        
+        self._drop_queued()
+        self._loop = loop
+        self._queue = asyncio.PriorityQueue()
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+    
+    def enqueue(self, bot, message, priority=0, chat_id=TELEGRAM_CHAT_ID, on_done=None):
+        """Queue a message for delivery without waiting for it to be sent
+        
+        on_done, if given, is called exactly once with whether Telegram
+        accepted the message: False when it failed or was dropped at shutdown.
+        """
+        self._ensure_started()
+        # The sequence number keeps FIFO order within a priority level
+        self._queue.put_nowait((-priority, next(self._sequence), bot, chat_id, message, on_done))
+    
+    @staticmethod
+    def _settle(on_done, delivered):
+        if on_done is None:
+            return
+        try:
+            on_done(delivered)
+        except Exception as e:
+            logger.error(f"Error settling alert: {str(e)}")
+    
+    def _drop_queued(self):
+        """Discard alerts that will never be sent, settling each as undelivered"""
+        while self._queue is not None and not self._queue.empty():
+            self._settle(self._queue.get_nowait()[-1], False)
+            self._queue.task_done()
+    
+    async def _worker(self):
+        while True:
+            _, _, bot, chat_id, message, on_done = await self._queue.get()
+            delivered = False
+            try:
+                delivered = await send_telegram_alert(bot, message, chat_id)
+            except Exception as e:
+                logger.error(f"Error dispatching alert: {str(e)}")
+            finally:
+                # Also runs when the worker is cancelled mid-send at shutdown
+                self._queue.task_done()
+                self._settle(on_done, delivered)
+    
+    async def join(self):
+        """Wait until every queued alert has been handled"""
+        if self._queue is not None:
+            await self._queue.join()
+    
+    async def stop(self):
+        """Cancel the worker tasks, dropping any alerts still queued"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._drop_queued()
+        self._tasks = []
+        self._queue = None
+        self._loop = None
+
+alert_dispatcher = AlertDispatcher(DISPATCH_WORKERS)
+
+def institutional_action(activity):
+    """Map an institutional position to BUY, SELL or None when flat"""
+    if activity['net_position'] > 0:
+        return "BUY"
+    elif activity['net_position'] < 0:
+        return "SELL"
+    return None
+
+class SignalStateTable:
+    """Last alerted institutional signal per symbol, for cooldowns and change detection"""
+    
+    def __init__(self, cooldown, position_change, ttl):
+        self.cooldown = cooldown
+        self.position_change = position_change
+        self.ttl = ttl
+        self._states = {}  # symbol -> {'action', 'net_position', 'price', 'alerted_at'}
+        self._in_flight = set()  # Symbols with an alert queued but not yet delivered
+    
+    def get(self, symbol):
+        return self._states.get(symbol)
+    
+    def is_due(self, symbol, action, net_position, now=None):
+        """Check whether a signal differs materially from the last one or its cooldown expired
+        
+        Symbols with an alert still waiting in the dispatcher are never due.
+        """
+        if symbol in self._in_flight:
+            return False
+        
+        now = time.time() if now is None else now
+        state = self._states.get(symbol)
+        if state is None or state['action'] != action:
+            return True
+        
+        if now - state['alerted_at'] >= self.cooldown:
+            return True
+        
+        previous = abs(state['net_position'])
+        return abs(net_position - state['net_position']) >= self.position_change * max(previous, 1)
+    
+    def record(self, symbol, action, net_position, price, now=None):
+        """Remember the signal just alerted for a symbol"""
+        now = time.time() if now is None else now
+        self._states[symbol] = {
+            'action': action,
+            'net_position': net_position,
+            'price': price,
+            'alerted_at': now
+        }
+        self.prune(now)
+    
+    def mark_in_flight(self, symbol):
+        """Hold a symbol back from new signals while its alert is queued"""
+        self._in_flight.add(symbol)
+    
+    def settle(self, symbol, action, net_position, price, delivered):
+        """Release a queued symbol, remembering its signal only if the alert was delivered"""
+        self._in_flight.discard(symbol)
+        if delivered:
+            self.record(symbol, action, net_position, price)
+    
+    def prune(self, now):
+        """Forget symbols whose last signal is older than the TTL"""
+        expired = [symbol for symbol, state in self._states.items() if now - state['alerted_at'] > self.ttl]
+        for symbol in expired:
+            del self._states[symbol]
+    
+    def clear(self):
+        self._states.clear()
+        self._in_flight.clear()
+    
+    def __len__(self):
+        return len(self._states)
+
+signal_states = SignalStateTable(SIGNAL_COOLDOWN, SIGNAL_POSITION_CHANGE, SIGNAL_STATE_TTL)
+
+def pending_institutional_symbols(institutional_index):
+    """Symbols whose institutional signal is new, changed materially or out of cooldown"""
+    return {
+        symbol: activity for symbol, activity in institutional_index.items()
+        if institutional_action(activity)
+        and signal_states.is_due(symbol, institutional_action(activity), activity['net_position'])
+    }
+
+def build_trading_signals(news_candidates, institutional_index, market_data, volatility_model=None):
+    """Turn news candidates and institutional positions into actionable signals
+    
+    Price targets use volatility_model (VOLATILITY_MODEL by default) from
+    each symbol's volatility profile.
+    """
+    # Process actionable news
+    actionable_news = []
+    
+    # (news item, price, volatility profile) awaiting price targets, computed in one batch
+    pending_targets = []
+    
+    # Process news items
+    for news, headline, sentiment, symbol, whale_activity in news_candidates:
+        stock_data, volatility = market_data.get(symbol, (None, None))
+        
+        if stock_data:
+            # Check for volume spikes, measuring locally when IndianAPI doesn't report them
+            volume_change = stock_data.get('volume_change_percent', None)
+            if volume_change is None:
+                volume_change = tick_store.volume_spike(symbol)
+            
+            # Determine action, with today's live bar folded into the technicals
+            technicals = indicator_engine.peek_quote(symbol, stock_data)
+            action, reason = determine_action(sentiment, volume_change, whale_activity, technicals)
+            
+            # Only include BUY or SELL signals
+            if action in ["BUY", "SELL"]:
+                # Calculate impact level
+                impact = determine_news_impact(headline, sentiment, volume_change)
+                
+                # Create news item
+                news_item = {
+                    'symbol': symbol,
+                    'sector': stock_data.get('sector', 'N/A'),
+                    'headline': headline,
+                    'sentiment': sentiment,
+                    'impact': impact,
+                    'action': action,
+                    'reason': reason,
+                    'url': news.get('url', '')
+                }
+                
+                # Queue price targets
+                current_price = stock_data.get('last_price')
+                if current_price:
+                    pending_targets.append((news_item, current_price, volatility))
+                
+                actionable_news.append(news_item)
+    
+    # Also process institutional activity without news
+    signalled_symbols = {}
+    for news_item in actionable_news:
+        signalled_symbols.setdefault(news_item['symbol'], []).append(news_item)
+    
+    for symbol, activity in institutional_index.items():
+        action = institutional_action(activity)
+        if not action:
+            continue
+        
+        # A news alert already covers this symbol; once one with the same action
+        # is delivered, remember the position it reflected
+        if symbol in signalled_symbols:
+            matching = [news_item for news_item in signalled_symbols[symbol] if news_item['action'] == action]
+            if matching:
+                stock_data, _ = market_data.get(symbol, (None, None))
+                matching[0]['signal_state'] = (symbol, action, activity['net_position'], stock_data.get('last_price'))
+            continue
+        
+        # Skip positions already alerted unless they changed materially or cooled down
+        if not signal_states.is_due(symbol, action, activity['net_position']):
+            continue
+        
+        stock_data, volatility = market_data.get(symbol, (None, None))
+        
+        if stock_data:
+            # Determine action
+            if action == "BUY":
+                reason = f"Institutional buying of {activity['buy_quantity']} shares"
+            else:
+                reason = f"Institutional selling of {activity['sell_quantity']} shares"
+            reason += describe_technical_confirmation(action, indicator_engine.peek_quote(symbol, stock_data))
+            
+            # Show how far the price moved since this signal was last alerted
+            current_price = stock_data.get('last_price')
+            previous = signal_states.get(symbol)
+            if previous and previous['price'] and current_price:
+                move = (current_price / previous['price'] - 1) * 100
+                reason += f" ({move:+.1f}% since last alert)"
+            
+            # Create news item
+            news_item = {
+                'symbol': symbol,
+                'sector': stock_data.get('sector', 'N/A'),
+                'headline': f"Institutional {'buying' if action == 'BUY' else 'selling'} activity detected",
+                'sentiment': "Positive" if action == "BUY" else "Negative",
+                'impact': "High",  # Institutional activity has high impact
+                'action': action,
+                'reason': reason
+            }
+            
+            # Queue price targets
+            if current_price:
+                pending_targets.append((news_item, current_price, volatility))
+            
+            # Remembered only once the alert is actually delivered
+            news_item['signal_state'] = (symbol, action, activity['net_position'], current_price)
+            actionable_news.append(news_item)
+    
+    # Calculate price targets for every signal at once
+    attach_price_targets(pending_targets, volatility_model)
+    
+    return actionable_news
 
 async def check_news_and_send_alerts(application):
     """Main function to check for news and send alerts"""
@@ -380,16 +2158,59 @@ async def check_news_and_send_alerts(application):
         logger.info("Market is closed. No alerts will be sent.")
         return
     
-    # Get market news from Indian API
-    news_items = fetch_market_news_from_indian_api()
+    # Two cycles at once would race on the dedupe store and double-send alerts
+    if scan_lock.locked():
+        logger.warning("Previous scan cycle is still running. Skipping this one.")
+        metrics.inc("tradebot_scan_cycles_skipped_total")
+        return
+    
+    async with scan_lock:
+        cycle_started = time.perf_counter()
+        deadline = time.monotonic() + current_scan_interval * SCAN_DEADLINE_FRACTION
+        try:
+            return await scan_news_and_send_alerts(application, deadline)
+        finally:
+            cycle_duration = time.perf_counter() - cycle_started
+            metrics.observe("tradebot_scan_cycle_duration_seconds", cycle_duration)
+            metrics.set_gauge("tradebot_scan_cycle_last_duration_seconds", cycle_duration)
+            metrics.set_gauge("tradebot_scan_interval_seconds", current_scan_interval)
+            if cycle_duration > current_scan_interval:
+                metrics.inc("tradebot_scan_cycle_overruns_total")
+                logger.warning(f"Scan cycle took {cycle_duration:.1f}s, longer than the {current_scan_interval:.0f}s interval")
+
+def estimate_candidate_priority(headline, sentiment, whale_activity):
+    """Rank a news candidate before its market data is known
     
-    # Get institutional activity
-    institutional_activity = fetch_institutional_activity()
+    Uses the impact the headline would get without a volume spike, with
+    institutional confirmation as a tie-breaker.
+    """
+    impact = determine_news_impact(headline, sentiment, None)
+    return IMPACT_PRIORITY[impact], whale_activity is not None
+
+async def scan_news_and_send_alerts(application, deadline=None, volatility_model=None):
+    """Run one scan cycle: fetch news and market data, build signals and queue alerts
     
-    # Process actionable news
-    actionable_news = []
+    Market data is fetched highest expected impact first, and price targets
+    use volatility_model (VOLATILITY_MODEL by default). Candidates whose
+    symbols weren't reached by the deadline carry over to the next cycle.
+    Returns activity stats used by the scheduler to pick the next interval.
+    """
+    global deferred_candidates
     
-    # Process news items
+    # Get market news and institutional activity concurrently
+    _, institutional_activity = await asyncio.gather(
+        timed_stage("news_fetch", get_market_snapshot('news', refresh=True)),
+        timed_stage("institutional_fetch", get_market_snapshot('institutional', refresh=True))
+    )
+    
+    # Only headlines published since the last poll need processing
+    news_items = news_poller.drain()
+    
+    # Index institutional activity by symbol once per fetch; a failed fetch has none
+    institutional_index = build_institutional_index(institutional_activity or [])
+    
+    # Collect news items not seen before
+    new_news = []
     for news in news_items:
         # Skip if already processed
         news_id = f"{news.get('headline', '')}_{news.get('published_at', '')}"
@@ -398,177 +2219,175 @@ async def check_news_and_send_alerts(application):
         
         # Add to processed news
         processed_news.add(news_id)
-        
-        # Analyze sentiment
+        new_news.append(news)
+    
+    # Persist the dedupe store so a restart doesn't re-alert the feed
+    processed_news.save()
+    
+    # Analyze sentiment for the whole batch at once
+    sentiments = await timed_stage("sentiment", score_headlines_batch([news.get('headline', '') for news in new_news]))
+    
+    # Collect (news, symbol) pairs that can produce a trading signal
+    news_candidates = []
+    for news in new_news:
         headline = news.get('headline', '')
-        sentiment = analyze_sentiment(headline)
+        sentiment = sentiments[headline][1]
         
         # Find if any symbol is associated with this news
         for symbol in news.get('symbols', []):
-            # Get stock data
-            stock_data = fetch_stock_data_from_indian_api(symbol)
+            # Check if this stock has institutional activity
+            whale_activity = None
+            activity = institutional_index.get(symbol)
+            if activity:
+                if activity['net_position'] > 0:
+                    whale_activity = "buying"
+                elif activity['net_position'] < 0:
+                    whale_activity = "selling"
             
-            if stock_data:
-                # Check for volume spikes
-                volume_change = stock_data.get('volume_change_percent', None)
-                
-                # Check if this stock has institutional activity
-                whale_activity = None
-                for activity in institutional_activity:
-                    if activity.get('symbol') == symbol:
-                        if activity.get('net_position', 0) > 0:
-                            whale_activity = "buying"
-                        elif activity.get('net_position', 0) < 0:
-                            whale_activity = "selling"
-                
-                # Determine action
-                action, reason = determine_action(sentiment, volume_change, whale_activity)
-                
-                # Only include BUY or SELL signals
-                if action in ["BUY", "SELL"]:
-                    # Calculate impact level
-                    impact = determine_news_impact(headline, sentiment, volume_change)
-                    
-                    # Create news item
-                    news_item = {
-                        'symbol': symbol,
-                        'sector': stock_data.get('sector', 'N/A'),
-                        'headline': headline,
-                        'sentiment': sentiment,
-                        'impact': impact,
-                        'action': action,
-                        'reason': reason,
-                        'url': news.get('url', '')
-                    }
-                    
-                    # Calculate volatility for price targets
-                    volatility = fetch_stock_volatility(symbol)
-                    
-                    # Calculate price targets
-                    current_price = stock_data.get('last_price')
-                    if current_price:
-                        price_targets = calculate_price_targets(
-                            current_price, 
-                            action, 
-                            volatility
-                        )
-                        news_item['price_targets'] = price_targets
-                    
-                    actionable_news.append(news_item)
-    
-    # Also process institutional activity without news
-    for activity in institutional_activity:
-        symbol = activity.get('symbol')
-        
-        # Skip if we already have this symbol in actionable news
-        if any(news['symbol'] == symbol for news in actionable_news):
-            continue
-        
-        if activity.get('net_position', 0) != 0:  # Significant position
-            # Get stock data
-            stock_data = fetch_stock_data_from_indian_api(symbol)
+            # Volume alone never turns a neutral headline into a signal,
+            # so skip the market data fetch when the action would be HOLD
+            if determine_action(sentiment, None, whale_activity)[0] == "HOLD":
+                continue
             
-            if stock_data:
-                # Determine action
-                if activity.get('net_position', 0) > 0:
-                    action = "BUY"
-                    reason = f"Institutional buying of {activity.get('buy_quantity', 0)} shares"
-                else:
-                    action = "SELL"
-                    reason = f"Institutional selling of {activity.get('sell_quantity', 0)} shares"
-                
-                # Create news item
-                news_item = {
-                    'symbol': symbol,
-                    'sector': stock_data.get('sector', 'N/A'),
-                    'headline': f"Institutional {'buying' if action == 'BUY' else 'selling'} activity detected",
-                    'sentiment': "Positive" if action == "BUY" else "Negative",
-                    'impact': "High",  # Institutional activity has high impact
-                    'action': action,
-                    'reason': reason
-                }
-                
-                # Calculate volatility for price targets
-                volatility = fetch_stock_volatility(symbol)
-                
-                # Calculate price targets
-                current_price = stock_data.get('last_price')
-                if current_price:
-                    price_targets = calculate_price_targets(
-                        current_price, 
-                        action, 
-                        volatility
-                    )
-                    news_item['price_targets'] = price_targets
-                
-                actionable_news.append(news_item)
+            news_candidates.append((news, headline, sentiment, symbol, whale_activity))
+    
+    # Pick up candidates the previous cycle ran out of time for
+    news_candidates = deferred_candidates + news_candidates
+    
+    # Rank the distinct symbols that need quotes and volatility by expected impact;
+    # institutional-only signals are always high impact, larger positions first.
+    # Positions alerted recently and unchanged since need no fetch at all.
+    symbol_priority = {}
+    for news, headline, sentiment, symbol, whale_activity in news_candidates:
+        priority = estimate_candidate_priority(headline, sentiment, whale_activity) + (0,)
+        symbol_priority[symbol] = max(symbol_priority.get(symbol, priority), priority)
+    for symbol, activity in pending_institutional_symbols(institutional_index).items():
+        priority = (IMPACT_PRIORITY["High"], True, abs(activity['net_position']))
+        symbol_priority[symbol] = max(symbol_priority.get(symbol, priority), priority)
+    symbols = sorted(symbol_priority, key=symbol_priority.get, reverse=True)
+    
+    # Fetch market data concurrently, starting no new symbols past the deadline
+    market_data = await fetch_symbols_market_data(symbols, deadline)
+    
+    # Carry unreached news candidates over; institutional activity is refetched anyway
+    deferred_symbols = [symbol for symbol in symbols if symbol not in market_data]
+    deferred_candidates = [candidate for candidate in news_candidates if candidate[3] not in market_data]
+    deferred_candidates.sort(key=lambda c: estimate_candidate_priority(c[1], c[2], c[4]), reverse=True)
+    deferred_candidates = deferred_candidates[:SCAN_DEFERRED_LIMIT]
+    metrics.set_gauge("tradebot_scan_deferred_symbols", len(deferred_symbols))
+    if deferred_symbols:
+        logger.warning(f"Scan deadline reached; deferring {len(deferred_symbols)} symbols to the next cycle")
+    
+    # Build BUY/SELL signals from the fetched data
+    with metrics.time("tradebot_stage_duration_seconds", stage="signal_build"):
+        actionable_news = build_trading_signals(news_candidates, institutional_index, market_data, volatility_model)
     
     # Sort by impact level
-    actionable_news.sort(key=lambda x: ["Low", "Medium", "High"].index(x['impact']), reverse=True)
+    actionable_news.sort(key=lambda x: IMPACT_PRIORITY[x['impact']], reverse=True)
     
     if actionable_news:
         logger.info(f"Found {len(actionable_news)} actionable trading signals")
         
+        # Hand alerts to the background dispatcher so the scan returns immediately
         for news_item in actionable_news:
-            alert_message = format_alert(news_item)
-            await send_telegram_alert(application.bot, alert_message)
-            # Add a small delay between messages to avoid rate limiting
-            await asyncio.sleep(1)
+            with metrics.time("tradebot_stage_duration_seconds", stage="format"):
+                alert_message = format_alert(news_item)
+            # Signal state is only recorded once delivered; until then the symbol
+            # is held in flight so the next cycle doesn't queue it a second time
+            on_done = None
+            if 'signal_state' in news_item:
+                state = news_item['signal_state']
+                signal_states.mark_in_flight(state[0])
+                on_done = lambda delivered, state=state: signal_states.settle(*state, delivered)
+            alert_dispatcher.enqueue(application.bot, alert_message, IMPACT_PRIORITY[news_item['impact']], on_done=on_done)
     else:
         logger.info("No actionable trading signals found")
+    
+    volatilities = [select_volatility(profile, volatility_model) for _, profile in market_data.values() if profile]
+    volatilities = [volatility for volatility in volatilities if not np.isnan(volatility)]
+    return {
+        'new_headlines': len(new_news),
+        'signals': len(actionable_news),
+        'high_impact_signals': sum(1 for news_item in actionable_news if news_item['impact'] == "High"),
+        'mean_volatility': float(np.mean(volatilities)) if volatilities else 0.0,
+        'deferred_symbols': len(deferred_symbols)
+    }
+
+async def fetch_market_endpoint(path):
+    """Fetch a market endpoint, returning its JSON payload or None on failure"""
+    response = await indian_api_get(path)
+    
+    if response.status_code == 200:
+        return response.json()
+    
+    logger.error(f"Failed to get {path}: {response.status_code}")
+    return None
+
+async def gather_report_sources(sources, timeout=REPORT_SOURCE_TIMEOUT):
+    """Fetch report data sources concurrently; failed or slow sources map to None"""
+    async def fetch_source(name, coroutine):
+        try:
+            return await asyncio.wait_for(coroutine, timeout)
+        except asyncio.TimeoutError:
+            logger.error(f"Report source '{name}' timed out after {timeout}s")
+        except Exception as e:
+            logger.error(f"Report source '{name}' failed: {str(e)}")
+        return None
+    
+    names = list(sources)
+    results = await asyncio.gather(*(fetch_source(name, sources[name]) for name in names))
+    return dict(zip(names, results))
+
+# Shared snapshots of market-wide endpoints, refreshed by the scheduler and read by commands
+MARKET_SNAPSHOT_FETCHERS = {
+    'news': fetch_market_news_from_indian_api,
+    'institutional': fetch_institutional_activity,
+    'indices': lambda: fetch_market_endpoint("/market/indices"),
+    'most_active': lambda: fetch_market_endpoint("/market/most-active")
+}
+market_snapshots = {
+    name: SingleFlightCache(1, ttl=ttl, stale_ttl=stale_ttl, name=f"snapshot_{name}")
+    for name, (ttl, stale_ttl) in MARKET_SNAPSHOT_TTLS.items()
+}
+
+async def get_market_snapshot(name, refresh=False):
+    """Get a market-wide endpoint snapshot, serving stale data while it revalidates"""
+    return await market_snapshots[name].get(name, MARKET_SNAPSHOT_FETCHERS[name], refresh=refresh)
+
+async def refresh_market_snapshots():
+    """Refresh the snapshots that command handlers read but the scan doesn't fetch"""
+    await asyncio.gather(
+        get_market_snapshot('indices', refresh=True),
+        get_market_snapshot('most_active', refresh=True)
+    )
+
+def degraded_section(title):
+    """Placeholder for a report section whose data source failed"""
+    return f"{title}\n• _Data unavailable right now_\n\n"
 
 async def daily_market_outlook(application):
     """Generate and send a daily market outlook"""
     # Check if market is open today or will open today
     now = datetime.now()
-    current_day = now.weekday()
     
-    if current_day not in MARKET_DAYS:
+    if not is_trading_day(now.date()):
         logger.info("Market closed today. No outlook will be sent.")
         return
     
     logger.info("Generating daily market outlook...")
     
     try:
-        # Get market data from IndianAPI
-        url = "https://indianapi.in/api/v1/market/indices"
-        
-        # Add your API key to headers
-        api_headers = {
-            'Authorization': f'Bearer {INDIAN_API_KEY}',
-            'Content-Type': 'application/json'
-        }
-        
-        response = requests.get(url, headers=api_headers, timeout=10)
-        
-        if response.status_code == 200:
-            indices_data = response.json().get('data', [])
-        else:
-            logger.error(f"Failed to get indices data: {response.status_code}")
-            indices_data = []
-            
-        # Get sector performance
-        sector_url = "https://indianapi.in/api/v1/market/sectors"
-        sector_response = requests.get(sector_url, headers=api_headers, timeout=10)
-        
-        if sector_response.status_code == 200:
-            sector_data = sector_response.json().get('data', [])
-        else:
-            logger.error(f"Failed to get sector data: {sector_response.status_code}")
-            sector_data = []
-        
-        # Get market sentiment and outlook
-        sentiment_url = "https://indianapi.in/api/v1/market/sentiment"
-        sentiment_response = requests.get(sentiment_url, headers=api_headers, timeout=10)
-        
-        if sentiment_response.status_code == 200:
-            sentiment_data = sentiment_response.json()
-            market_sentiment = sentiment_data.get('overall_sentiment', 'Neutral')
-            market_outlook = sentiment_data.get('outlook', 'Neutral')
-        else:
-            logger.error(f"Failed to get sentiment data: {sentiment_response.status_code}")
-            market_sentiment = "Neutral"
-            market_outlook = "Neutral"
+        # Fetch every data source concurrently so one slow endpoint can't delay the rest
+        sources = await gather_report_sources({
+            'indices': fetch_market_endpoint("/market/indices"),
+            'sectors': fetch_market_endpoint("/market/sectors"),
+            'sentiment': fetch_market_endpoint("/market/sentiment"),
+            'institutional': fetch_institutional_activity()
+        })
+        
+        indices_data = sources['indices'].get('data', []) if sources['indices'] else None
+        sector_data = sources['sectors'].get('data', []) if sources['sectors'] else None
+        sentiment_data = sources['sentiment']
             
         # Format the message
         current_date = datetime.now().strftime("%d-%b-%Y")
@@ -580,7 +2399,9 @@ async def daily_market_outlook(application):
 """
 
         # Add index performance if available
-        if indices_data:
+        if indices_data is None:
+            message += degraded_section("📈 *Index Performance:*")
+        elif indices_data:
             message += "📈 *Index Performance:*\n"
             for index in indices_data[:3]:  # Limit to top 3 indices
                 name = index.get('name', 'Unknown')
@@ -591,7 +2412,9 @@ async def daily_market_outlook(application):
             message += "\n"
         
         # Add sector performance if available
-        if sector_data:
+        if sector_data is None:
+            message += degraded_section("📊 *Sector Performance:*")
+        elif sector_data:
             # Sort sectors by performance
             sector_data.sort(key=lambda x: x.get('change_percent', 0), reverse=True)
             
@@ -613,15 +2436,24 @@ async def daily_market_outlook(application):
             message += "\n"
         
         # Add market sentiment and outlook
-        message += f"🧭 *Market Sentiment:* {market_sentiment}\n"
-        message += f"🔍 *Market Outlook:* {market_outlook}\n\n"
+        if sentiment_data is None:
+            message += degraded_section("🧭 *Market Sentiment:*")
+        else:
+            market_sentiment = sentiment_data.get('overall_sentiment', 'Neutral')
+            market_outlook = sentiment_data.get('outlook', 'Neutral')
+            message += f"🧭 *Market Sentiment:* {market_sentiment}\n"
+            message += f"🔍 *Market Outlook:* {market_outlook}\n\n"
         
         # Add institutional activity summary
-        inst_activity = fetch_institutional_activity()
-        if inst_activity:
+        if sources['institutional'] is None:
+            message += degraded_section("🐋 *Institutional Activity:*")
+            inst_index = {}
+        else:
+            inst_index = build_institutional_index(sources['institutional'])
+        
+        if inst_index:
             # Calculate net institutional activity
-            net_buy = sum(1 for item in inst_activity if item.get('net_position', 0) > 0)
-            net_sell = sum(1 for item in inst_activity if item.get('net_position', 0) < 0)
+            net_buy, net_sell = count_institutional_positions(inst_index)
             
             message += "🐋 *Institutional Activity:*\n"
             message += f"• Net Buying: {net_buy} stocks\n"
@@ -631,11 +2463,11 @@ async def daily_market_outlook(application):
             message += "*Notable Institutional Activity:*\n"
             
             # Sort by absolute net position
-            inst_activity.sort(key=lambda x: abs(x.get('net_position', 0)), reverse=True)
+            notable_activity = sorted(inst_index.values(), key=lambda x: abs(x['net_position']), reverse=True)
             
-            for activity in inst_activity[:3]:  # Top 3 activities
-                symbol = activity.get('symbol', 'Unknown')
-                position = activity.get('net_position', 0)
+            for activity in notable_activity[:3]:  # Top 3 activities
+                symbol = activity['symbol']
+                position = activity['net_position']
                 icon = '🟢' if position > 0 else '🔴'
                 action = "buying" if position > 0 else "selling"
                 message += f"• {symbol}: Institutional {action} {icon}\n"
@@ -649,6 +2481,10 @@ async def daily_market_outlook(application):
         await send_telegram_alert(application.bot, message)
         logger.info("Daily market outlook sent")
         
+        # Warm the volatility cache for stocks with institutional interest
+        if inst_index:
+            await warm_volatility_cache(inst_index)
+        
     except Exception as e:
         logger.error(f"Error generating daily market outlook: {str(e)}")
 
@@ -656,31 +2492,27 @@ async def run_end_of_day_summary(application):
     """Generate and send an end-of-day market summary"""
     # Check if market was open today
     now = datetime.now()
-    current_day = now.weekday()
     
-    if current_day not in MARKET_DAYS:
+    if not is_trading_day(now.date()):
         logger.info("Market was closed today. No summary will be sent.")
         return
     
     logger.info("Generating end-of-day market summary...")
     
     try:
-        # Get market data from IndianAPI
-        url = "https://indianapi.in/api/v1/market/indices"
-        
-        # Add your API key to headers
-        api_headers = {
-            'Authorization': f'Bearer {INDIAN_API_KEY}',
-            'Content-Type': 'application/json'
-        }
-        
-        response = requests.get(url, headers=api_headers, timeout=10)
-        
-        if response.status_code == 200:
-            indices_data = response.json().get('data', [])
-        else:
-            logger.error(f"Failed to get indices data: {response.status_code}")
-            indices_data = []
+        # Fetch every data source concurrently so one slow endpoint can't delay the rest
+        sources = await gather_report_sources({
+            'indices': fetch_market_endpoint("/market/indices"),
+            'gainers': fetch_market_endpoint("/market/top-gainers"),
+            'losers': fetch_market_endpoint("/market/top-losers"),
+            'sectors': fetch_market_endpoint("/market/sectors"),
+            'institutional': fetch_institutional_activity(),
+            'breadth': fetch_market_endpoint("/market/breadth"),
+            'volume': fetch_market_endpoint("/market/volume"),
+            'sentiment': fetch_market_endpoint("/market/sentiment")
+        })
+        
+        indices_data = sources['indices'].get('data', []) if sources['indices'] else None
         
         # Format the message
         current_date = datetime.now().strftime("%d-%b-%Y")
@@ -691,7 +2523,9 @@ async def run_end_of_day_summary(application):
 
 """
         # Add index performance if available
-        if indices_data:
+        if indices_data is None:
+            message += degraded_section("📈 *Index Performance:*")
+        elif indices_data:
             message += "📈 *Index Performance:*\n"
             for index in indices_data[:5]:  # Top 5 indices
                 name = index.get('name', 'Unknown')
@@ -702,15 +2536,11 @@ async def run_end_of_day_summary(application):
             
             message += "\n"
         
-        # Get top gainers and losers
-        gainers_url = "https://indianapi.in/api/v1/market/top-gainers"
-        losers_url = "https://indianapi.in/api/v1/market/top-losers"
-        
-        gainers_response = requests.get(gainers_url, headers=api_headers, timeout=10)
-        losers_response = requests.get(losers_url, headers=api_headers, timeout=10)
-        
-        if gainers_response.status_code == 200:
-            gainers_data = gainers_response.json().get('data', [])
+        # Add top gainers and losers
+        if sources['gainers'] is None:
+            message += degraded_section("🟢 *Top Gainers:*")
+        else:
+            gainers_data = sources['gainers'].get('data', [])
             
             message += "🟢 *Top Gainers:*\n"
             for gainer in gainers_data[:5]:  # Top 5 gainers
@@ -721,8 +2551,10 @@ async def run_end_of_day_summary(application):
             
             message += "\n"
         
-        if losers_response.status_code == 200:
-            losers_data = losers_response.json().get('data', [])
+        if sources['losers'] is None:
+            message += degraded_section("🔴 *Top Losers:*")
+        else:
+            losers_data = sources['losers'].get('data', [])
             
             message += "🔴 *Top Losers:*\n"
             for loser in losers_data[:5]:  # Top 5 losers
@@ -733,12 +2565,11 @@ async def run_end_of_day_summary(application):
             
             message += "\n"
         
-        # Get sector performance for the day
-        sector_url = "https://indianapi.in/api/v1/market/sectors"
-        sector_response = requests.get(sector_url, headers=api_headers, timeout=10)
-        
-        if sector_response.status_code == 200:
-            sector_data = sector_response.json().get('data', [])
+        # Add sector performance for the day
+        if sources['sectors'] is None:
+            message += degraded_section("🔍 *Sector Performance:*")
+        else:
+            sector_data = sources['sectors'].get('data', [])
             
             # Sort sectors by performance
             sector_data.sort(key=lambda x: x.get('change_percent', 0), reverse=True)
@@ -762,22 +2593,23 @@ async def run_end_of_day_summary(application):
             message += "\n"
         
         # Add institutional activity summary
-        inst_activity = fetch_institutional_activity()
-        if inst_activity:
-            # Calculate net institutional activity
-            net_buy = sum(1 for item in inst_activity if item.get('net_position', 0) > 0)
-            net_sell = sum(1 for item in inst_activity if item.get('net_position', 0) < 0)
-            
-            message += "🐋 *Institutional Activity:*\n"
-            message += f"• Net Buying: {net_buy} stocks\n"
-            message += f"• Net Selling: {net_sell} stocks\n\n"
-        
-        # Get market breadth data
-        breadth_url = "https://indianapi.in/api/v1/market/breadth"
-        breadth_response = requests.get(breadth_url, headers=api_headers, timeout=10)
+        if sources['institutional'] is None:
+            message += degraded_section("🐋 *Institutional Activity:*")
+        else:
+            inst_index = build_institutional_index(sources['institutional'])
+            if inst_index:
+                # Calculate net institutional activity
+                net_buy, net_sell = count_institutional_positions(inst_index)
+                
+                message += "🐋 *Institutional Activity:*\n"
+                message += f"• Net Buying: {net_buy} stocks\n"
+                message += f"• Net Selling: {net_sell} stocks\n\n"
         
-        if breadth_response.status_code == 200:
-            breadth_data = breadth_response.json()
+        # Add market breadth data
+        breadth_data = sources['breadth']
+        if breadth_data is None:
+            message += degraded_section("📊 *Market Breadth:*")
+        else:
             advancers = breadth_data.get('advancers', 0)
             decliners = breadth_data.get('decliners', 0)
             unchanged = breadth_data.get('unchanged', 0)
@@ -788,11 +2620,10 @@ async def run_end_of_day_summary(application):
             message += f"• Unchanged: {unchanged}\n\n"
         
         # Add volume information
-        volume_url = "https://indianapi.in/api/v1/market/volume"
-        volume_response = requests.get(volume_url, headers=api_headers, timeout=10)
-        
-        if volume_response.status_code == 200:
-            volume_data = volume_response.json()
+        volume_data = sources['volume']
+        if volume_data is None:
+            message += degraded_section("💹 *Market Volume:*")
+        else:
             total_volume = volume_data.get('total_volume', 0)
             avg_volume = volume_data.get('average_volume', 0)
             
@@ -815,12 +2646,9 @@ async def run_end_of_day_summary(application):
         # Add next day outlook
         message += "🔮 *Next Day Outlook:*\n"
         
-        # Get sentiment data for outlook
-        sentiment_url = "https://indianapi.in/api/v1/market/sentiment"
-        sentiment_response = requests.get(sentiment_url, headers=api_headers, timeout=10)
-        
-        if sentiment_response.status_code == 200:
-            sentiment_data = sentiment_response.json()
+        # Use sentiment data for the outlook when available
+        sentiment_data = sources['sentiment']
+        if sentiment_data:
             market_sentiment = sentiment_data.get('overall_sentiment', 'Neutral')
             market_outlook = sentiment_data.get('outlook', 'Neutral')
             
@@ -923,19 +2751,11 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     # Get market indices status
     try:
-        # Endpoint for market indices
-        url = "https://indianapi.in/api/v1/market/indices"
+        # Market indices snapshot
+        indices = await get_market_snapshot('indices')
         
-        # Add your API key to headers
-        api_headers = {
-            'Authorization': f'Bearer {INDIAN_API_KEY}',
-            'Content-Type': 'application/json'
-        }
-        
-        response = requests.get(url, headers=api_headers, timeout=10)
-        
-        if response.status_code == 200:
-            indices_data = response.json().get('data', [])
+        if indices is not None:
+            indices_data = indices.get('data', [])
             
             # Format indices information
             indices_info = ""
@@ -970,39 +2790,30 @@ async def status_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     
     # Calculate next market open time
     now = datetime.now()
-    current_day = now.weekday()
-    current_time = now.time()
-    
-    if current_day in MARKET_DAYS and current_time < MARKET_OPEN_TIME:
-        # Market opens today
-        next_open = f"Today at {MARKET_OPEN_TIME.strftime('%H:%M')}"
-    elif current_day in MARKET_DAYS and current_time >= MARKET_CLOSE_TIME:
-        # Market closed for today, opens tomorrow if tomorrow is a market day
-        if current_day < 4:  # Not Friday
-            next_open = f"Tomorrow at {MARKET_OPEN_TIME.strftime('%H:%M')}"
-        else:  # Friday, next open is Monday
-            next_open = f"Monday at {MARKET_OPEN_TIME.strftime('%H:%M')}"
-    elif current_day in MARKET_DAYS:
+    next_open_at = next_market_open(now)
+    
+    if is_market_open():
         # Market is currently open
         next_open = "Market is currently open"
+    elif next_open_at is None:
+        next_open = "Unknown (trading calendar needs updating)"
     else:
-        # Weekend or holiday, find next market day
-        days_to_add = 1
-        next_day = (current_day + days_to_add) % 7
-        
-        while next_day not in MARKET_DAYS:
-            days_to_add += 1
-            next_day = (current_day + days_to_add) % 7
-        
-        next_market_day = {
-            0: "Monday",
-            1: "Tuesday",
-            2: "Wednesday",
-            3: "Thursday",
-            4: "Friday"
-        }.get(next_day)
-        
-        next_open = f"{next_market_day} at {MARKET_OPEN_TIME.strftime('%H:%M')}"
+        days_ahead = (next_open_at.date() - now.date()).days
+        open_time = next_open_at.strftime('%H:%M')
+        
+        if days_ahead == 0:
+            next_open = f"Today at {open_time}"
+        elif days_ahead == 1:
+            next_open = f"Tomorrow at {open_time}"
+        elif days_ahead < 7:
+            next_open = f"{next_open_at.strftime('%A')} at {open_time}"
+        else:
+            next_open = f"{next_open_at.strftime('%d-%b-%Y')} at {open_time}"
+    
+    # Mention the holiday when the exchange is closed for one today
+    holiday = market_calendar.holidays.get(now.date().isoformat())
+    if holiday:
+        next_open += f"\n_Today is a market holiday: {holiday}_"
     
     status_message += next_open
     
@@ -1016,19 +2827,11 @@ async def stocks_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not args:
         # No symbol provided, list top stocks being tracked
         try:
-            # Get market movers from IndianAPI
-            url = "https://indianapi.in/api/v1/market/most-active"
-            
-            # Add your API key to headers
-            api_headers = {
-                'Authorization': f'Bearer {INDIAN_API_KEY}',
-                'Content-Type': 'application/json'
-            }
-            
-            response = requests.get(url, headers=api_headers, timeout=10)
+            # Get market movers snapshot
+            most_active = await get_market_snapshot('most_active')
             
-            if response.status_code == 200:
-                stocks_data = response.json().get('data', [])
+            if most_active is not None:
+                stocks_data = most_active.get('data', [])
                 
                 if not stocks_data:
                     await update.message.reply_text("No stock data available.", parse_mode='Markdown')
@@ -1055,7 +2858,7 @@ async def stocks_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 
                 await update.message.reply_text(message, parse_mode='Markdown')
             else:
-                await update.message.reply_text(f"Error fetching stock data: {response.status_code}", parse_mode='Markdown')
+                await update.message.reply_text("Unable to fetch stock data right now.", parse_mode='Markdown')
         
         except Exception as e:
             logger.error(f"Error in stocks command: {str(e)}")
@@ -1067,7 +2870,7 @@ async def stocks_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         
         try:
             # Get stock data from IndianAPI
-            stock_data = fetch_stock_data_from_indian_api(symbol)
+            stock_data = await get_stock_quote(symbol)
             
             if not stock_data:
                 await update.message.reply_text(f"No data found for symbol *{symbol}*. Please check the symbol and try again.", parse_mode='Markdown')
@@ -1086,8 +2889,10 @@ async def stocks_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
             # Calculate price icon
             price_icon = '🟢' if change > 0 else '🔴' if change < 0 else '⚪'
             
-            # Calculate volume change
-            volume_change = stock_data.get('volume_change_percent', 0)
+            # Calculate volume change, measuring locally when IndianAPI doesn't report it
+            volume_change = stock_data.get('volume_change_percent')
+            if volume_change is None:
+                volume_change = tick_store.volume_spike(symbol) or 0
             volume_icon = '📈' if volume_change > 20 else '📉' if volume_change < -20 else '↔️'
             
             message = f"""
@@ -1104,31 +2909,55 @@ async def stocks_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 """
             
+            # Add intraday figures from the quotes seen so far today
+            session_vwap = tick_store.vwap(symbol)
+            recent_return = tick_store.intraday_return(symbol, VOLUME_SPIKE_WINDOW)
+            if session_vwap is not None or recent_return is not None:
+                message += "⏱️ *Intraday:*\n"
+                
+                if session_vwap is not None:
+                    message += f"• VWAP: ₹{session_vwap:.2f}\n"
+                
+                if recent_return is not None:
+                    message += f"• Last {VOLUME_SPIKE_WINDOW // 60} min: {recent_return * 100:+.2f}%\n"
+                
+                message += "\n"
+            
+            # Compute technicals locally, falling back to any IndianAPI includes
+            await ensure_indicator_history(symbol)
+            technicals = indicator_engine.peek_quote(symbol, stock_data) or stock_data
+            
             # Add technical indicators if available
-            if 'rsi' in stock_data or 'macd' in stock_data or 'ema_50' in stock_data:
+            if 'rsi' in technicals or 'macd' in technicals or 'ema_50' in technicals:
                 message += "📉 *Technical Indicators:*\n"
                 
-                if 'rsi' in stock_data:
-                    rsi = stock_data.get('rsi')
-                    rsi_status = "Overbought ⚠️" if rsi > 70 else "Oversold ⚠️" if rsi < 30 else "Neutral ↔️"
+                if 'rsi' in technicals:
+                    rsi = technicals.get('rsi')
+                    rsi_status = "Overbought ⚠️" if rsi > RSI_OVERBOUGHT else "Oversold ⚠️" if rsi < RSI_OVERSOLD else "Neutral ↔️"
                     message += f"• RSI: {rsi:.2f} ({rsi_status})\n"
                 
-                if 'macd' in stock_data and 'macd_signal' in stock_data:
-                    macd = stock_data.get('macd')
-                    macd_signal = stock_data.get('macd_signal')
+                if 'macd' in technicals and 'macd_signal' in technicals:
+                    macd = technicals.get('macd')
+                    macd_signal = technicals.get('macd_signal')
                     macd_status = "Bullish 🟢" if macd > macd_signal else "Bearish 🔴"
                     message += f"• MACD: {macd_status}\n"
                 
-                if 'ema_50' in stock_data and 'ema_200' in stock_data:
-                    ema_50 = stock_data.get('ema_50')
-                    ema_200 = stock_data.get('ema_200')
+                if 'ema_50' in technicals and 'ema_200' in technicals:
+                    ema_50 = technicals.get('ema_50')
+                    ema_200 = technicals.get('ema_200')
                     ema_status = "Bullish 🟢" if ema_50 > ema_200 else "Bearish 🔴"
                     message += f"• EMA: {ema_status} (50 vs 200)\n"
                 
+                if 'atr' in technicals:
+                    message += f"• ATR: ₹{technicals['atr']:.2f}\n"
+                
+                if 'bollinger_upper' in technicals:
+                    message += f"• Bollinger: ₹{technicals['bollinger_lower']:.2f} - ₹{technicals['bollinger_upper']:.2f}\n"
+                
                 message += "\n"
             
             # Add news for this stock if available
-            news_items = fetch_market_news_from_indian_api()
+            news_items = await get_market_snapshot('news') or []
             stock_news = [news for news in news_items if symbol in news.get('symbols', [])]
             
             if stock_news:
@@ -1141,21 +2970,16 @@ async def stocks_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
                 message += "\n"
             
             # Check for institutional activity
-            inst_activity = fetch_institutional_activity()
-            stock_inst_activity = [activity for activity in inst_activity if activity.get('symbol') == symbol]
+            inst_index = build_institutional_index(await get_market_snapshot('institutional') or [])
+            activity = inst_index.get(symbol)
             
-            if stock_inst_activity:
+            if activity:
                 message += "🐋 *Institutional Activity:*\n"
                 
-                for activity in stock_inst_activity:
-                    net_pos = activity.get('net_position', 0)
-                    buy_qty = activity.get('buy_quantity', 0)
-                    sell_qty = activity.get('sell_quantity', 0)
-                    
-                    if net_pos > 0:
-                        message += f"• Net Buying: {buy_qty} shares 🟢\n"
-                    else:
-                        message += f"• Net Selling: {sell_qty} shares 🔴\n"
+                if activity['net_position'] > 0:
+                    message += f"• Net Buying: {activity['buy_quantity']} shares 🟢\n"
+                else:
+                    message += f"• Net Selling: {activity['sell_quantity']} shares 🔴\n"
             
             await update.message.reply_text(message, parse_mode='Markdown')
         
@@ -1230,31 +3054,106 @@ In the full implementation, actual performance would be tracked.
 """
     await update.message.reply_text(message, parse_mode='Markdown')
 
+async def metrics_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Show pipeline metrics to admins when the command /metrics is issued."""
+    if str(update.effective_chat.id) not in ADMIN_CHAT_IDS:
+        await update.message.reply_text("This command is only available to bot admins.")
+        return
+    
+    # Prometheus text isn't valid Markdown, so send it as plain text in chunks
+    text = metrics.render()
+    if not text.strip():
+        await update.message.reply_text("No metrics recorded yet.")
+        return
+    
+    for i in range(0, len(text), TELEGRAM_MESSAGE_LIMIT):
+        await update.message.reply_text(text[i:i + TELEGRAM_MESSAGE_LIMIT])
+
+def compute_scan_interval(now, scan_stats):
+    """Pick the next scan interval from session phase, news velocity and volatility"""
+    # Poll tightly while the opening rush settles
+    session = market_calendar.session_bounds(now)
+    if session and now - session[0] < timedelta(minutes=OPENING_RUSH_MINUTES):
+        return SCAN_INTERVAL_MIN
+    
+    if not scan_stats:
+        return SCAN_INTERVAL
+    
+    # A busy feed, deferred work, high-impact signals or volatile stocks need tight polling
+    if (scan_stats['new_headlines'] >= BUSY_FEED_HEADLINES
+            or scan_stats['deferred_symbols'] > 0
+            or scan_stats['high_impact_signals'] > 0
+            or scan_stats['mean_volatility'] >= HIGH_VOLATILITY):
+        return SCAN_INTERVAL_MIN
+    
+    # Back off gradually while the feed stays quiet
+    if scan_stats['new_headlines'] == 0:
+        return min(current_scan_interval * SCAN_BACKOFF_FACTOR, SCAN_INTERVAL_MAX)
+    
+    return SCAN_INTERVAL
+
+def next_scan_delay(now, scan_stats):
+    """Seconds until the next scan: the adaptive interval, or the next open when closed"""
+    if not is_market_open():
+        # Sleep until the open instead of waking up on nights, weekends and holidays
+        next_open = next_market_open(now)
+        if next_open is None:
+            logger.warning("Market calendar has no future sessions; update the calendar file")
+            return SCAN_INTERVAL_MAX
+        return max((next_open - now).total_seconds(), 1)
+    
+    return compute_scan_interval(now, scan_stats)
+
 # Scheduled job to check for news and send alerts
 async def scheduled_job(context):
-    """Run scheduled tasks"""
-    job = context.job
-    application = context.application
+    """Run a scan cycle and schedule the next one for the current market conditions"""
+    global current_scan_interval
     
-    current_hour = datetime.now().hour
-    current_minute = datetime.now().minute
+    application = context.application
+    scan_stats = None
     
-    # Check for news and send alerts every 15 minutes during market hours
-    if is_market_open():
-        await check_news_and_send_alerts(application)
+    try:
+        if is_market_open():
+            scan_stats, _ = await asyncio.gather(
+                check_news_and_send_alerts(application),
+                refresh_market_snapshots()
+            )
+    finally:
+        delay = next_scan_delay(datetime.now(), scan_stats)
+        if is_market_open():
+            current_scan_interval = delay
+        
+        logger.info(f"Next scan in {delay:.0f}s")
+        context.job_queue.run_once(scheduled_job, when=delay, name="scan")
+
+def schedule_daily_report(job_queue, report, at_time):
+    """Run a report coroutine at the next local occurrence of at_time, every day"""
+    async def report_job(context):
+        try:
+            await report(context.application)
+        finally:
+            schedule_daily_report(context.job_queue, report, at_time)
     
-    # Send daily market outlook at 9:00 AM on market days
-    if current_hour == 9 and current_minute == 0:
-        await daily_market_outlook(application)
+    now = datetime.now()
+    target = datetime.combine(now.date(), at_time)
+    if target <= now:
+        target += timedelta(days=1)
     
-    # Send end of day summary at 3:45 PM on market days
-    if current_hour == 15 and current_minute == 45:
-        await run_end_of_day_summary(application)
+    job_queue.run_once(report_job, when=(target - now).total_seconds(), name=report.__name__)
+
+async def shutdown(application):
+    """Release shared resources when the application stops"""
+    await alert_dispatcher.stop()
+    await close_http_client()
+    shutdown_sentiment_pool()
 
 def main():
     """Start the bot."""
+    # Restore processed news from the previous run
+    processed_news.load()
+    
     # Create the Application
-    application = Application.builder().token(TELEGRAM_TOKEN).build()
+    application = Application.builder().token(TELEGRAM_TOKEN).post_shutdown(shutdown).build()
 
     # Add command handlers
     application.add_handler(CommandHandler("start", start))
@@ -1263,10 +3162,20 @@ def main():
     application.add_handler(CommandHandler("stocks", stocks_command))
     application.add_handler(CommandHandler("watchlist", watchlist_command))
     application.add_handler(CommandHandler("performance", performance_command))
+    application.add_handler(CommandHandler("metrics", metrics_command))
+    
+    # Expose pipeline metrics on a local port
+    if METRICS_PORT:
+        try:
+            start_metrics_server()
+        except OSError as e:
+            logger.error(f"Could not start metrics endpoint: {str(e)}")
 
-    # Schedule job to run every 5 minutes
+    # Schedule the adaptive scan loop and the daily reports
     job_queue = application.job_queue
-    job_queue.run_repeating(scheduled_job, interval=300, first=10)
+    job_queue.run_once(scheduled_job, when=10, name="scan")
+    schedule_daily_report(job_queue, daily_market_outlook, OUTLOOK_TIME)
+    schedule_daily_report(job_queue, run_end_of_day_summary, EOD_SUMMARY_TIME)
 
     # Start the Bot
     application.run_polling()
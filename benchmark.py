@@ -0,0 +1,324 @@
+# Benchmark Suite for the Trading Bot Signal Pipeline
+# Features:
+# - Synthetic news feeds of 10, 100, 1,000 and 10,000 headlines (or a recorded feed)
+# - Per-call timing of the pure signal functions, plus the batched price target API
+# - End-to-end check_news_and_send_alerts cycles against the local stub API
+# - Throughput, p50/p99 latency and peak traced memory for every benchmark
+# - Results appended to a JSON lines file and compared with the previous run
+#
+# Usage:
+#   python benchmark.py
+#   python benchmark.py --sizes 10 100 --repeat 5 --latency 0.02
+#   python benchmark.py --recording recording.jsonl.gz
+
+import os
+import gc
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import tempfile
+import subprocess
+import tracemalloc
+from datetime import datetime, timedelta
+
+from replay_harness import (
+    load_bot_module, load_recording, route_key, prepare_offline_bot,
+    run_offline, StubIndianAPI
+)
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+DEFAULT_RESULTS_FILE = "benchmark_results.jsonl"
+
+SYMBOLS = [
+    "RELIANCE", "TCS", "INFY", "HDFCBANK", "ICICIBANK", "SBIN", "ITC", "LT",
+    "AXISBANK", "KOTAKBANK", "BHARTIARTL", "HINDUNILVR", "MARUTI", "SUNPHARMA",
+    "TATAMOTORS", "TATASTEEL", "WIPRO", "HCLTECH", "ONGC", "NTPC", "POWERGRID",
+    "ADANIENT", "BAJFINANCE", "ASIANPAINT", "ULTRACEMCO", "TITAN", "NESTLEIND",
+    "DRREDDY", "CIPLA", "COALINDIA"
+]
+
+HEADLINE_TEMPLATES = [
+    "{symbol} announces major contract win worth Rs {amount} crore",
+    "{symbol} shares slump after profit warning for the quarter",
+    "{symbol} board approves stock split and special dividend",
+    "Regulator opens investigation into {symbol} accounting practices",
+    "{symbol} quarterly results beat estimates on strong margins",
+    "{symbol} trades flat ahead of sector review",
+    "Brokerage upgrades {symbol} citing significant growth outlook",
+    "{symbol} faces lawsuit over delayed project delivery",
+    "{symbol} completes acquisition of mid-size rival",
+    "Analysts see limited upside for {symbol} this year"
+]
+
+def percentile(samples, fraction):
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered))) - 1))
+    return ordered[index]
+
+def summarize(name, size, latencies, elapsed, peak_bytes, items):
+    """Build the result record for one benchmark"""
+    return {
+        'name': name,
+        'size': size,
+        'items': items,
+        'throughput_per_s': items / elapsed if elapsed > 0 else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+        'total_s': elapsed,
+        'peak_memory_kb': peak_bytes / 1024
+    }
+
+def measure_peak_memory(run):
+    """Peak traced memory in bytes while running a callable"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def synthetic_news(size, seed=0):
+    """Generate a deterministic news feed with symbol tags"""
+    rng = random.Random(seed)
+    news_items = []
+
+    for i in range(size):
+        symbol = rng.choice(SYMBOLS)
+        headline = rng.choice(HEADLINE_TEMPLATES).format(symbol=symbol, amount=rng.randint(100, 9000))
+        news_items.append({
+            'headline': f"{headline} ({i})",
+            'published_at': f"2026-01-01T09:{i // 60 % 60:02d}:{i % 60:02d}",
+            'symbols': [symbol],
+            'url': f"https://example.com/news/{i}"
+        })
+
+    return news_items
+
+def synthetic_routes(news_items, seed=0):
+    """Build stub API routes serving a synthetic feed and market data"""
+    rng = random.Random(seed)
+    routes = {
+        route_key("/news/market"): [(200, json.dumps({'data': news_items}))],
+        route_key("/institutions/activity"): [(200, json.dumps({'data': [
+            {
+                'symbol': symbol,
+                'net_position': rng.choice([-1, 1]) * rng.randint(10000, 500000),
+                'buy_quantity': rng.randint(10000, 500000),
+                'sell_quantity': rng.randint(10000, 500000)
+            }
+            for symbol in rng.sample(SYMBOLS, 5)
+        ]}))]
+    }
+
+    for symbol in SYMBOLS:
+        price = round(rng.uniform(100, 4000), 2)
+        routes[route_key(f"/stock/{symbol}")] = [(200, json.dumps({
+            'symbol': symbol,
+            'sector': 'Synthetic',
+            'last_price': price,
+            'change_percent': round(rng.uniform(-3, 3), 2),
+            'open': price,
+            'high': round(price * 1.01, 2),
+            'low': round(price * 0.99, 2),
+            'volume': rng.randint(100000, 5000000),
+            'volume_change_percent': round(rng.uniform(-40, 160), 1)
+        }))]
+
+        closes = [price]
+        for _ in range(250):
+            closes.append(round(closes[-1] * (1 + rng.gauss(0, 0.015)), 2))
+        routes[route_key(f"/stock/{symbol}/historical")] = [(200, json.dumps({'data': [
+            {
+                'date': (datetime(2025, 1, 1) + timedelta(days=day)).date().isoformat(),
+                'open': close,
+                'high': round(close * 1.01, 2),
+                'low': round(close * 0.99, 2),
+                'close': close,
+                'volume': rng.randint(100000, 5000000)
+            }
+            for day, close in enumerate(closes)
+        ]}))]
+
+    return routes
+
+def build_signal_items(bot, news_items):
+    """Build alert dicts for format_alert from a news feed"""
+    items = []
+    for i, news in enumerate(news_items):
+        action = "BUY" if i % 2 == 0 else "SELL"
+        item = {
+            'symbol': news['symbols'][0],
+            'sector': 'Synthetic',
+            'headline': news['headline'],
+            'sentiment': "Positive" if action == "BUY" else "Negative",
+            'impact': ["Low", "Medium", "High"][i % 3],
+            'action': action,
+            'reason': "Benchmark signal",
+            'url': news['url'],
+            'price_targets': bot.calculate_price_targets(1000.0 + i % 500, action, 0.02)
+        }
+        items.append(item)
+    return items
+
+def time_calls(function, inputs):
+    """Call a function on every input, returning per-call latencies and total time"""
+    latencies = []
+    started = time.perf_counter()
+    for args in inputs:
+        call_started = time.perf_counter()
+        function(*args)
+        latencies.append(time.perf_counter() - call_started)
+    return latencies, time.perf_counter() - started
+
+def benchmark_pure_functions(bot, news_items):
+    """Time the pure signal functions over a feed"""
+    size = len(news_items)
+    headlines = [news['headline'] for news in news_items]
+    sentiments = [bot.analyze_sentiment(headline) for headline in headlines]
+    signal_items = build_signal_items(bot, news_items)
+    rng = random.Random(size)
+    volumes = [rng.uniform(-40, 160) for _ in news_items]
+
+    cases = {
+        'analyze_sentiment': (bot.analyze_sentiment, [(headline,) for headline in headlines]),
+        'determine_news_impact': (bot.determine_news_impact,
+                                  [(h, s, v) for h, s, v in zip(headlines, sentiments, volumes)]),
+        'determine_action': (bot.determine_action,
+                             [(s, v, rng.choice([None, "buying", "selling"])) for s, v in zip(sentiments, volumes)]),
+        'calculate_price_targets': (bot.calculate_price_targets,
+                                    [(1000.0 + i % 500, "BUY" if i % 2 == 0 else "SELL", 0.02) for i in range(size)]),
+        'format_alert': (bot.format_alert, [(item,) for item in signal_items])
+    }
+
+    results = []
+    for name, (function, inputs) in cases.items():
+        # Measure cold sentiment cost rather than memo hits
+        bot.sentiment_cache.clear()
+        latencies, elapsed = time_calls(function, inputs)
+
+        bot.sentiment_cache.clear()
+        peak = measure_peak_memory(lambda: time_calls(function, inputs))
+        results.append(summarize(name, size, latencies, elapsed, peak, len(inputs)))
+
+    # The batch API prices the whole feed in one call; throughput counts signals
+    batch_inputs = [(
+        [1000.0 + i % 500 for i in range(size)],
+        ["BUY" if i % 2 == 0 else "SELL" for i in range(size)],
+        [0.02] * size
+    )]
+    latencies, elapsed = time_calls(bot.calculate_price_targets_batch, batch_inputs)
+    peak = measure_peak_memory(lambda: time_calls(bot.calculate_price_targets_batch, batch_inputs))
+    results.append(summarize('calculate_price_targets_batch', size, latencies, elapsed, peak, size))
+
+    return results
+
+def benchmark_scan(bot, routes, size, repeat, latency, error_rate):
+    """Time end-to-end scan cycles against the stub API"""
+    latencies = []
+    requests = 0
+
+    with StubIndianAPI(routes, latency=latency, error_rate=error_rate) as stub:
+        for _ in range(repeat):
+            with tempfile.TemporaryDirectory(prefix="replay_state_") as state_dir:
+                prepare_offline_bot(bot, stub.url, state_dir)
+                started = time.perf_counter()
+                asyncio.run(run_offline(bot, "scan"))
+                latencies.append(time.perf_counter() - started)
+        requests = stub.request_count // repeat
+
+        with tempfile.TemporaryDirectory(prefix="replay_state_") as state_dir:
+            prepare_offline_bot(bot, stub.url, state_dir)
+            peak = measure_peak_memory(lambda: asyncio.run(run_offline(bot, "scan")))
+
+    # Throughput is headlines processed per second of scan time
+    result = summarize('check_news_and_send_alerts', size, latencies, sum(latencies), peak, size * repeat)
+    result['api_requests_per_cycle'] = requests
+    return result
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+def load_previous_run(path):
+    """Return the last run stored in the results file, if any"""
+    if not os.path.exists(path):
+        return None
+
+    previous = None
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                previous = json.loads(line)
+    return previous
+
+def print_results(results, previous):
+    """Print a results table with changes against the previous run"""
+    baseline = {}
+    if previous:
+        baseline = {(r['name'], r['size']): r for r in previous['results']}
+
+    print(f"{'benchmark':<28}{'size':>7}{'ops/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'peak KB':>11}  vs previous")
+    for result in results:
+        change = ""
+        before = baseline.get((result['name'], result['size']))
+        if before and before['p50_ms'] > 0:
+            delta = (result['p50_ms'] / before['p50_ms'] - 1) * 100
+            change = f"p50 {'+' if delta >= 0 else ''}{delta:.1f}%"
+        print(f"{result['name']:<28}{result['size']:>7}{result['throughput_per_s']:>12.1f}"
+              f"{result['p50_ms']:>10.3f}{result['p99_ms']:>10.3f}{result['peak_memory_kb']:>11.1f}  {change}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the trading bot signal pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Headline counts to benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="End-to-end scan cycles per size")
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub API latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of stub requests that fail")
+    parser.add_argument("--recording", help="Use a recorded feed instead of synthetic data")
+    parser.add_argument("--skip-scan", action="store_true", help="Only benchmark the pure functions")
+    parser.add_argument("--results", default=DEFAULT_RESULTS_FILE, help="JSON lines file to append results to")
+    options = parser.parse_args()
+
+    bot = load_bot_module()
+    results = []
+
+    if options.recording:
+        routes = load_recording(options.recording)
+        status, body = routes[route_key("/news/market")][-1]
+        feeds = [(json.loads(body).get('data', []), routes)]
+    else:
+        feeds = []
+        for size in options.sizes:
+            news_items = synthetic_news(size)
+            feeds.append((news_items, synthetic_routes(news_items)))
+
+    for news_items, routes in feeds:
+        results.extend(benchmark_pure_functions(bot, news_items))
+        if not options.skip_scan:
+            results.append(benchmark_scan(bot, routes, len(news_items), options.repeat,
+                                          options.latency, options.error_rate))
+
+    previous = load_previous_run(options.results)
+    print_results(results, previous)
+
+    run = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'options': vars(options),
+        'results': results
+    }
+    with open(options.results, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(run) + "\n")
+
+if __name__ == '__main__':
+    main()
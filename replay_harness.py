@@ -0,0 +1,288 @@
+# Offline Record/Replay Harness for the Indian Stock Market Trading Bot
+# Features:
+# - Replays IndianAPI.in responses recorded by the bot (INDIAN_API_RECORD_FILE)
+# - Local stub HTTP server with configurable latency and error injection
+# - Fake Telegram bot, update and context objects that collect outgoing messages
+# - Runs the news scan, daily outlook, EOD summary and command handlers offline
+#
+# Recording:
+#   INDIAN_API_RECORD_FILE=recording.jsonl.gz python "Enhanced Indian Stock Market Trading Bot.py"
+# Replaying:
+#   python replay_harness.py recording.jsonl.gz scan --latency 0.05 --error-rate 0.1
+
+import os
+import sys
+import gzip
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import tempfile
+import threading
+import importlib.util
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+logger = logging.getLogger(__name__)
+
+BOT_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Enhanced Indian Stock Market Trading Bot.py")
+
+def load_bot_module(name="trading_bot"):
+    """Import the bot script as a module (its file name isn't importable directly)"""
+    if name in sys.modules:
+        return sys.modules[name]
+
+    spec = importlib.util.spec_from_file_location(name, BOT_SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    # Register before executing so process pool workers can pickle its functions
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+# Query parameters that vary with the date or local state rather than the data requested
+IGNORED_PARAMS = {
+    'historical': {'period'}
+}
+
+def route_key(path, params=None):
+    """Build the lookup key for a request path and its query parameters"""
+    ignored = IGNORED_PARAMS.get(path.rstrip('/').rsplit('/', 1)[-1], set())
+    return (path, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items() if k not in ignored)))
+
+def load_recording(path):
+    """Load a recorded log into {route key: [(status, body), ...]} in request order"""
+    routes = defaultdict(list)
+
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            routes[route_key(entry['path'], entry.get('params'))].append((entry['status'], entry['body']))
+
+    return dict(routes)
+
+class StubIndianAPI:
+    """Local HTTP server that answers IndianAPI.in requests from recorded routes
+
+    Each route replays its responses in order and keeps repeating the last
+    one, so successive scan cycles see the feed evolve as it did live.
+    Latency and error injection draw from an RNG seeded by (seed, route,
+    attempt), so each route sees the same outcomes whatever order
+    concurrent requests arrive in.
+    """
+
+    def __init__(self, routes, latency=0.0, jitter=0.0, error_rate=0.0, seed=0):
+        self.routes = routes
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.seed = seed
+        self.request_count = 0
+        self._attempts = defaultdict(int)
+        self._positions = defaultdict(int)
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _next_response(self, path, params):
+        with self._lock:
+            self.request_count += 1
+            key = route_key(path, params)
+            attempt = self._attempts[key]
+            self._attempts[key] = attempt + 1
+
+            draw = random.Random(f"{self.seed}:{key}:{attempt}")
+            delay = self.latency + draw.uniform(0, self.jitter)
+            if self.error_rate and draw.random() < self.error_rate:
+                return delay, 500, json.dumps({'error': 'injected failure'})
+
+            responses = self.routes.get(key) or self.routes.get(route_key(path))
+            if not responses:
+                return delay, 404, json.dumps({'data': []})
+
+            position = self._positions[key]
+            self._positions[key] = position + 1
+            status, body = responses[min(position, len(responses) - 1)]
+            return delay, status, body
+
+    def start(self):
+        """Start serving on an ephemeral localhost port in a background thread"""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                delay, status, body = stub._next_response(parts.path, dict(parse_qsl(parts.query)))
+                if delay:
+                    time.sleep(delay)
+
+                payload = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+class FakeBot:
+    """Stand-in for telegram.Bot that records every outgoing message"""
+
+    def __init__(self):
+        self.messages = []
+
+    async def send_message(self, chat_id, text, **kwargs):
+        self.messages.append({'chat_id': chat_id, 'text': text, **kwargs})
+        return None
+
+class FakeMessage:
+    """Stand-in for telegram.Message that records replies"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+    async def reply_text(self, text, **kwargs):
+        self.bot.messages.append({'chat_id': 'reply', 'text': text, **kwargs})
+        return None
+
+class FakeUpdate:
+    """Minimal telegram.Update for invoking command handlers"""
+
+    def __init__(self, bot, chat_id=None):
+        self.message = FakeMessage(bot)
+        self.effective_chat = type('FakeChat', (), {'id': chat_id})()
+
+class FakeContext:
+    """Minimal ContextTypes.DEFAULT_TYPE carrying command arguments"""
+
+    def __init__(self, args=None):
+        self.args = list(args or [])
+
+class FakeApplication:
+    """Minimal telegram.ext.Application exposing the fake bot"""
+
+    def __init__(self, bot):
+        self.bot = bot
+
+def prepare_offline_bot(bot_module, base_url, state_dir):
+    """Point the bot at a stub API and isolate it from live state and clocks
+
+    Dedupe and history files go under state_dir, which the caller owns and
+    removes, typically a tempfile.TemporaryDirectory.
+    """
+    bot_module.INDIAN_API_BASE_URL = base_url
+    bot_module.API_RECORD_FILE = None
+
+    # Keep replay state out of the live dedupe snapshot
+    bot_module.processed_news = bot_module.NewsDedupeStore(
+        os.path.join(state_dir, "processed_news.json"),
+        bot_module.NEWS_DEDUPE_WINDOW
+    )
+
+    # Treat the market as open so runs don't depend on the wall clock
+    bot_module.is_market_open = lambda: True
+    bot_module.is_trading_day = lambda day: True
+
+    # Don't throttle fake sends to Telegram's real limits
+    bot_module.telegram_global_bucket = bot_module.TokenBucket(1e9, 1e9)
+    bot_module.TELEGRAM_PER_CHAT_RATE = 1e9
+    bot_module.TELEGRAM_PER_CHAT_BURST = 1e9
+    bot_module.telegram_chat_buckets.clear()
+
+    # Start every run with cold caches and a fresh news cursor
+    bot_module.news_poller = bot_module.NewsPoller(bot_module.NEWS_FEED_SIZE)
+    bot_module.deferred_candidates = []
+    bot_module.signal_states.clear()
+    bot_module.volatility_cache.clear()
+    bot_module.quote_snapshot.clear()
+    bot_module.tick_store.clear()
+    bot_module.sentiment_cache.clear()
+    bot_module.indicator_engine.clear()
+    bot_module.history_refreshes.clear()
+    bot_module.history_store = bot_module.HistoryStore(os.path.join(state_dir, "history"))
+    for snapshot in bot_module.market_snapshots.values():
+        snapshot.clear()
+
+    return bot_module
+
+async def run_offline(bot_module, target, args=None):
+    """Run one pipeline entry point against the stub API and return sent messages"""
+    fake_bot = FakeBot()
+    application = FakeApplication(fake_bot)
+
+    try:
+        if target == "scan":
+            await bot_module.check_news_and_send_alerts(application)
+            await bot_module.alert_dispatcher.join()
+        elif target == "outlook":
+            await bot_module.daily_market_outlook(application)
+        elif target == "eod":
+            await bot_module.run_end_of_day_summary(application)
+        else:
+            handler = getattr(bot_module, f"{target}_command", None) or getattr(bot_module, target)
+            await handler(FakeUpdate(fake_bot), FakeContext(args))
+    finally:
+        await bot_module.alert_dispatcher.stop()
+        await bot_module.close_http_client()
+
+    return fake_bot.messages
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay recorded IndianAPI.in traffic through the bot offline")
+    parser.add_argument("recording", help="Gzipped JSON lines log written via INDIAN_API_RECORD_FILE")
+    parser.add_argument("target", help="scan, outlook, eod, or a command name such as status or stocks")
+    parser.add_argument("args", nargs="*", help="Command arguments, e.g. a stock symbol")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every stub response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for latency jitter and error injection")
+    options = parser.parse_args()
+
+    logging.basicConfig(format='%(asctime)s - %(name)s - %(levelname)s - %(message)s', level=logging.INFO)
+
+    bot_module = load_bot_module()
+    routes = load_recording(options.recording)
+
+    with StubIndianAPI(routes, options.latency, options.jitter, options.error_rate, options.seed) as stub:
+        with tempfile.TemporaryDirectory(prefix="replay_state_") as state_dir:
+            prepare_offline_bot(bot_module, stub.url, state_dir)
+            started = time.perf_counter()
+            messages = asyncio.run(run_offline(bot_module, options.target, options.args))
+            elapsed = time.perf_counter() - started
+
+    for message in messages:
+        print(message['text'])
+        print("-" * 40)
+
+    print(f"{len(messages)} messages, {stub.request_count} API requests, {elapsed:.3f}s")
+
+if __name__ == '__main__':
+    main()
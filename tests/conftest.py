@@ -0,0 +1,32 @@
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# The harness lives at the repository root next to the bot script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from replay_harness import load_bot_module
+
+
+@pytest.fixture(scope="session")
+def bot():
+    """The bot script imported as a module"""
+    return load_bot_module()
+
+
+@pytest.fixture
+def make_history():
+    """Builder for random-walk daily OHLC bars, oldest first"""
+    def build(days=260, seed=7):
+        rng = np.random.default_rng(seed)
+        closes = 1000 * np.cumprod(1 + rng.normal(0, 0.015, days))
+        spread = closes * rng.uniform(0.002, 0.02, days)
+        return {
+            'date': [f"day{i}" for i in range(days)],
+            'high': closes + spread,
+            'low': closes - spread,
+            'close': closes
+        }
+    return build
@@ -0,0 +1,33 @@
+import pytest
+
+
+@pytest.fixture
+def clock(bot, monkeypatch):
+    """Controllable clock for the bot's caches"""
+    now = [1000.0]
+    monkeypatch.setattr(bot, "cache_clock", lambda: now[0])
+    return now
+
+
+def test_ttl_cache_expiry(bot, clock):
+    cache = bot.TTLCache(10, ttl=60)
+    cache.set("key", "value")
+
+    clock[0] += 59
+    assert cache.get("key") == "value"
+
+    clock[0] += 2
+    assert cache.get("key", "expired") == "expired"
+    assert len(cache) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used(bot, clock):
+    cache = bot.TTLCache(2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
@@ -0,0 +1,29 @@
+import os
+
+import pytest
+
+
+@pytest.fixture
+def lexicon(bot, monkeypatch):
+    """Swap in a small keyword lexicon with nested and overlapping terms"""
+    keywords = {'stock split': 2.0, 'split': 1.0, 'profit': 1.0, 'profit warning': 3.0, 'warning': 0.5}
+    monkeypatch.setattr(bot, "impact_keywords", keywords)
+    monkeypatch.setattr(bot, "impact_keyword_matcher", bot.compile_keyword_matcher(keywords))
+    monkeypatch.setattr(bot, "impact_keyword_nesting", bot.nest_keywords(keywords))
+    return keywords
+
+
+@pytest.mark.parametrize("headline", [
+    "Board approves Stock Split",
+    "Profit warning issued ahead of split",
+    "Split, split and split again",
+    "Quarterly update with no keywords",
+    "PROFIT WARNINGS and a stock splitting plan"
+])
+def test_score_matches_substring_test_per_keyword(bot, lexicon, headline):
+    expected = sum(weight for keyword, weight in lexicon.items() if keyword in headline.lower())
+    assert bot.score_impact_keywords(headline) == expected
+
+
+def test_keywords_file_resolves_next_to_script(bot):
+    assert os.path.dirname(bot.IMPACT_KEYWORDS_FILE) == os.path.dirname(os.path.abspath(bot.__file__))
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("alpha", [2.0 / 13, 2.0 / 201, 1.0 / 14, 0.9, 1.0])
+def test_ema_series_matches_loop(bot, make_history, alpha):
+    values = make_history(500)['close']
+    expected = [values[0]]
+    for value in values[1:]:
+        expected.append(expected[-1] + alpha * (value - expected[-1]))
+
+    np.testing.assert_allclose(bot.ema_series(values, alpha), expected, rtol=1e-9)
+
+
+@pytest.mark.parametrize("alpha", [0, -0.5, 1.5])
+def test_ema_series_rejects_alpha_outside_unit_interval(bot, alpha):
+    with pytest.raises(ValueError):
+        bot.ema_series([1.0, 2.0], alpha)
+
+
+def test_incremental_update_matches_full_seed(bot, make_history):
+    history = make_history()
+    split = 220
+
+    incremental = bot.IndicatorEngine(10)
+    incremental.seed("TEST", {name: values[:split] for name, values in history.items()})
+    for i in range(split, len(history['close'])):
+        incremental.update("TEST", history['high'][i], history['low'][i], history['close'][i], history['date'][i])
+
+    full = bot.IndicatorEngine(10)
+    full.seed("TEST", history)
+
+    assert incremental.peek("TEST") == pytest.approx(full.peek("TEST"), rel=1e-9, abs=1e-6)
+
+
+def test_indicator_engine_evicts_least_recently_used(bot, make_history):
+    history = make_history(60)
+    engine = bot.IndicatorEngine(2)
+    engine.seed("A", history)
+    engine.seed("B", history)
+    engine.peek("A")
+    engine.seed("C", history)
+
+    assert engine.peek("B") is None
+    assert engine.peek("A") is not None
+    assert engine.peek("C") is not None
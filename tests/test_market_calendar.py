@@ -0,0 +1,26 @@
+from datetime import datetime
+
+import pytest
+
+
+@pytest.fixture(scope="module")
+def calendar(bot):
+    return bot.MarketCalendar.from_file(bot.MARKET_CALENDAR_FILE)
+
+
+def test_next_open_skips_holiday_and_weekend(calendar):
+    # Friday 2 October 2026 is Gandhi Jayanti, so the next session is Monday
+    assert calendar.next_open(datetime(2026, 10, 1, 16, 0)) == datetime(2026, 10, 5, 9, 15)
+
+
+def test_next_open_during_session_is_next_day(calendar):
+    assert calendar.next_open(datetime(2026, 10, 6, 10, 0)) == datetime(2026, 10, 7, 9, 15)
+
+
+def test_muhurat_session_on_holiday(calendar):
+    # 21 October 2025 is a Diwali holiday with a one-hour Muhurat session
+    assert not calendar.is_open(datetime(2025, 10, 21, 10, 0))
+    assert calendar.is_open(datetime(2025, 10, 21, 14, 0))
+    assert not calendar.is_open(datetime(2025, 10, 21, 15, 0))
+    assert calendar.next_open(datetime(2025, 10, 21, 9, 0)) == datetime(2025, 10, 21, 13, 45)
+    assert calendar.next_open(datetime(2025, 10, 21, 14, 50)) == datetime(2025, 10, 23, 9, 15)
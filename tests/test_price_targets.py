@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+
+@pytest.mark.parametrize("price, tick", [
+    (99.99, 0.01),
+    (250.0, 0.05),
+    (999.99, 0.05),
+    (1000.0, 0.10),
+    (7500.0, 0.50),
+    (15000.0, 1.00),
+    (45000.0, 5.00)
+])
+def test_price_tick_sizes_by_band(bot, price, tick):
+    assert bot.price_tick_sizes(np.array([price]))[0] == tick
+
+
+def test_round_to_tick(bot):
+    prices = np.array([123.456, 512.37, 2048.26, 7501.3, 45002.6])
+    rounded = bot.round_to_tick(prices, bot.price_tick_sizes(prices))
+
+    np.testing.assert_allclose(rounded, [123.46, 512.35, 2048.3, 7501.5, 45005.0])
+
+
+def test_price_targets_are_r_multiples_from_entry(bot):
+    buy = bot.calculate_price_targets(1000.0, "BUY", 0.02)
+    assert buy == {
+        'entry_price': 1000.0, 'stop_loss': 980.0,
+        'target1': 1030.0, 'target2': 1050.0, 'target3': 1070.0,
+        'stop_loss_percent': -2.0,
+        'target1_percent': 3.0, 'target2_percent': 5.0, 'target3_percent': 7.0
+    }
+
+    sell = bot.calculate_price_targets(1000.0, "SELL", 0.02, r_multiples=[2.0], stop_r=0.5)
+    assert sell == {
+        'entry_price': 1000.0, 'stop_loss': 1010.0, 'target1': 980.0,
+        'stop_loss_percent': 1.0, 'target1_percent': -2.0
+    }
+
+
+@pytest.mark.parametrize("volatility", [None, 0.0, -0.01, float('nan')])
+def test_price_targets_default_missing_volatility(bot, volatility):
+    assert bot.calculate_price_targets(1000.0, "BUY", volatility) == bot.calculate_price_targets(
+        1000.0, "BUY", bot.DEFAULT_VOLATILITY
+    )
+
+
+def test_batch_price_targets_match_single_calls(bot):
+    prices = [87.3, 642.15, 2388.0, 7421.9, 31250.0]
+    actions = ["BUY", "SELL", "BUY", "SELL", "BUY"]
+    volatilities = [0.027, np.nan, 0.015, 0.04, 0.0]
+    batch = bot.calculate_price_targets_batch(prices, actions, volatilities)
+
+    for row, args in enumerate(zip(prices, actions, volatilities)):
+        assert bot.calculate_price_targets(*args) == {name: float(values[row]) for name, values in batch.items()}
+
+
+def test_batch_price_targets_select_model_from_profiles(bot):
+    profiles = [{'close_to_close': 0.02, 'ewma': 0.03, 'atr': 0.04}, {'ewma': 0.05}, None]
+    levels = bot.calculate_price_targets_batch([1000.0] * 3, ["BUY"] * 3, profiles, model="atr")
+    np.testing.assert_allclose(levels['stop_loss'], [960.0, 980.0, 980.0])
+
+    levels = bot.calculate_price_targets_batch([1000.0] * 3, ["BUY"] * 3, profiles, model="ewma")
+    np.testing.assert_allclose(levels['stop_loss'], [970.0, 950.0, 980.0])
@@ -0,0 +1,91 @@
+import json
+import asyncio
+
+import pytest
+
+from benchmark import synthetic_news, synthetic_routes
+from replay_harness import load_bot_module, prepare_offline_bot, route_key, run_offline, StubIndianAPI
+
+MARKET_ROUTES = {
+    route_key("/market/indices"): [(200, json.dumps({'data': [
+        {'name': 'NIFTY 50', 'change_percent': 0.84},
+        {'name': 'SENSEX', 'change_percent': 0.71}
+    ]}))],
+    route_key("/market/sectors"): [(200, json.dumps({'data': [
+        {'name': 'IT', 'change_percent': 1.2},
+        {'name': 'Metals', 'change_percent': -0.6}
+    ]}))],
+    route_key("/market/sentiment"): [(200, json.dumps({'overall_sentiment': 'Positive', 'outlook': 'Bullish'}))]
+}
+
+
+@pytest.fixture
+def routes():
+    """Synthetic feed and market data; tests may edit routes before replaying"""
+    return {**synthetic_routes(synthetic_news(50)), **MARKET_ROUTES}
+
+
+@pytest.fixture
+def replay(routes, tmp_path):
+    """Run a bot entry point against the stub API, returning the messages it sent"""
+    # A separate module instance keeps the offline patches away from other tests
+    bot_module = load_bot_module("trading_bot_replay")
+
+    with StubIndianAPI(routes) as stub:
+        prepare_offline_bot(bot_module, stub.url, str(tmp_path))
+        yield lambda target, args=None: asyncio.run(run_offline(bot_module, target, args))
+
+
+def test_scan_sends_alerts_once(replay):
+    first = replay("scan")
+    assert first
+    assert all("TRADING ALERT" in message['text'] for message in first)
+
+    # An unchanged feed and positions that were just alerted send nothing new
+    assert replay("scan") == []
+
+
+def test_outlook_reports_every_source(replay):
+    [message] = replay("outlook")
+    text = message['text']
+
+    assert "DAILY MARKET OUTLOOK" in text
+    assert "NIFTY 50: +0.84%" in text
+    assert "🧭 *Market Sentiment:* Positive" in text
+    assert "🔍 *Market Outlook:* Bullish" in text
+    assert "Data unavailable" not in text
+
+
+def test_outlook_degrades_failed_sources(routes, replay):
+    routes[route_key("/market/sentiment")] = [(500, json.dumps({'error': 'unavailable'}))]
+    routes[route_key("/institutions/activity")] = [(500, json.dumps({'error': 'unavailable'}))]
+
+    [message] = replay("outlook")
+    text = message['text']
+
+    assert "🧭 *Market Sentiment:*\n• _Data unavailable right now_" in text
+    assert "🐋 *Institutional Activity:*\n• _Data unavailable right now_" in text
+    assert "Neutral" not in text
+    assert "NIFTY 50: +0.84%" in text
+
+
+def test_history_routes_ignore_period():
+    path = "/stock/TCS/historical"
+    assert route_key(path, {'interval': 'daily', 'period': '5y'}) == route_key(path, {'interval': 'daily', 'period': '12d'})
+    assert route_key(path, {'interval': 'daily'}) != route_key(path, {'interval': 'weekly'})
+
+
+def test_stub_error_injection_is_independent_of_request_order():
+    routes = {route_key("/a"): [(200, '{}')], route_key("/b"): [(200, '{}')]}
+
+    def statuses(order):
+        stub = StubIndianAPI(routes, error_rate=0.5, seed=3)
+        seen = {"/a": [], "/b": []}
+        for path in order:
+            seen[path].append(stub._next_response(path, {})[1])
+        return seen
+
+    sequential = statuses(["/a"] * 20 + ["/b"] * 20)
+    interleaved = statuses(["/a", "/b"] * 20)
+    assert sequential == interleaved
+    assert 500 in sequential["/a"] and 200 in sequential["/a"]
@@ -0,0 +1,17 @@
+def test_signal_state_in_flight_until_settled(bot):
+    states = bot.SignalStateTable(cooldown=3600, position_change=0.5, ttl=86400)
+    assert states.is_due("TEST", "BUY", 1000)
+
+    states.mark_in_flight("TEST")
+    assert not states.is_due("TEST", "BUY", 1000)
+    assert not states.is_due("TEST", "SELL", -1000)
+
+    # A failed or dropped alert releases the symbol without recording it
+    states.settle("TEST", "BUY", 1000, 250.0, False)
+    assert states.get("TEST") is None
+    assert states.is_due("TEST", "BUY", 1000)
+
+    states.mark_in_flight("TEST")
+    states.settle("TEST", "BUY", 1000, 250.0, True)
+    assert states.get("TEST")['price'] == 250.0
+    assert not states.is_due("TEST", "BUY", 1000)
@@ -0,0 +1,19 @@
+import numpy as np
+
+
+def test_close_to_close_volatility_matches_np_std(bot, make_history):
+    closes = np.array([make_history(21, seed)['close'] for seed in range(5)])
+    returns = closes[:, 1:] / closes[:, :-1] - 1
+
+    np.testing.assert_allclose(bot.close_to_close_volatility(closes), np.std(returns, axis=1), rtol=1e-12)
+
+
+def test_close_to_close_volatility_skips_missing_leading_closes(bot, make_history):
+    closes = make_history(21)['close']
+    padded = np.concatenate(([np.nan] * 5, closes))
+
+    np.testing.assert_allclose(
+        bot.close_to_close_volatility(padded[None, :]),
+        np.std(closes[1:] / closes[:-1] - 1),
+        rtol=1e-12
+    )